@@ -6,7 +6,6 @@
 # The full license is in the file LICENSE, distributed with this software.
 # -----------------------------------------------------------------------------
 
-from functools import partial
 from os.path import join, dirname, abspath, isdir, expanduser, exists
 from os import environ, mkdir
 from base64 import b64encode
@@ -15,7 +14,25 @@ import warnings
 
 from .exceptions import MissingConfigSection
 
-from configparser import ConfigParser, Error, NoOptionError
+from configparser import ConfigParser, Error
+
+
+# Default configuration file, used when QIITA_CONFIG_FP is not set
+_DEFAULT_CONF_FP = join(dirname(abspath(__file__)),
+                        'support_files/config_test.cfg')
+
+
+# Values accepted as booleans, same as ConfigParser.getboolean
+_BOOL = {'1': True, 'yes': True, 'true': True, 'on': True,
+         '0': False, 'no': False, 'false': False, 'off': False}
+
+
+def _to_bool(value):
+    """Converts a configuration value to bool as ConfigParser.getboolean"""
+    try:
+        return _BOOL[value.strip().lower()]
+    except KeyError:
+        raise ValueError('Not a boolean: %s' % value)
 
 
 class ConfigurationManager(object):
@@ -122,27 +139,59 @@ class ConfigurationManager(object):
     ------
     Error
         When an option is no longer available.
+
+    Notes
+    -----
+    The configuration file is parsed only once per process: constructing a
+    ConfigurationManager for a file that has already been loaded returns the
+    same instance. Use `reload` to force the configuration to be parsed again.
     """
-    def __init__(self):
-        # If conf_fp is None, we default to the test configuration file
+    # Loaded instances, keyed by configuration filepath
+    _instances = {}
+    _required_sections = frozenset({'main', 'redis', 'postgres', 'smtp', 'ebi',
+                                    'portal'})
+
+    def __new__(cls):
+        # If QIITA_CONFIG_FP is not set, we default to the test configuration
+        # file
+        conf_fp = environ.get('QIITA_CONFIG_FP', _DEFAULT_CONF_FP)
         try:
-            conf_fp = environ['QIITA_CONFIG_FP']
+            return cls._instances[conf_fp]
         except KeyError:
-            conf_fp = join(dirname(abspath(__file__)),
-                           'support_files/config_test.cfg')
+            pass
+
+        instance = super(ConfigurationManager, cls).__new__(cls)
+        instance._load(conf_fp)
+        cls._instances[conf_fp] = instance
+        return instance
+
+    @classmethod
+    def reload(cls):
+        """Forgets all the loaded configurations
+
+        The next ConfigurationManager constructed will parse the
+        configuration file again
+        """
+        cls._instances.clear()
+
+    def _load(self, conf_fp):
+        """Parses the configuration file `conf_fp`"""
         self.conf_fp = conf_fp
 
         # Parse the configuration file
-        config = ConfigParser()
+        parser = ConfigParser()
+        # The file is small, read it at once instead of line by line
         with open(conf_fp, newline=None) as conf_file:
-            config.read_file(conf_file)
+            parser.read_string(conf_file.read(), source=conf_fp)
 
-        _required_sections = {'main', 'redis', 'postgres', 'smtp', 'ebi',
-                              'portal'}
-        if not _required_sections.issubset(set(config.sections())):
-            missing = _required_sections - set(config.sections())
+        missing = self._required_sections.difference(parser.sections())
+        if missing:
             raise MissingConfigSection(', '.join(missing))
 
+        # Snapshot the values into plain dicts so the _get_* helpers below
+        # don't go through the ConfigParser API for every option
+        config = {sec: dict(parser.items(sec)) for sec in parser.sections()}
+
         self._get_main(config)
         self._get_smtp(config)
         self._get_torque(config)
@@ -155,49 +204,46 @@ class ConfigurationManager(object):
 
     def _get_main(self, config):
         """Get the configuration of the main section"""
-        self.test_environment = config.getboolean('main', 'TEST_ENVIRONMENT')
+        sec = config['main']
+
+        self.test_environment = _to_bool(sec['test_environment'])
         install_dir = dirname(dirname(abspath(__file__)))
         default_base_data_dir = join(install_dir, 'qiita_db', 'support_files',
                                      'test_data')
-        self.base_data_dir = config.get('main', 'BASE_DATA_DIR') or \
-            default_base_data_dir
+        self.base_data_dir = sec['base_data_dir'] or default_base_data_dir
 
-        try:
-            log_path = config.get('main', 'LOG_PATH')
-            if log_path:
-                raise Error('The option LOG_PATH in the main section is no '
-                            'longer supported, use LOG_DIR instead.')
-        except NoOptionError:
-            pass
+        if sec.get('log_path'):
+            raise Error('The option LOG_PATH in the main section is no '
+                        'longer supported, use LOG_DIR instead.')
 
-        self.log_dir = config.get('main', 'LOG_DIR')
+        self.log_dir = sec['log_dir']
         if self.log_dir:
             # if the option is a directory, it will exist
             if not isdir(self.log_dir):
                 raise ValueError("The LOG_DIR (%s) option is required to be a "
                                  "directory." % self.log_dir)
 
-        self.base_url = config.get('main', 'BASE_URL')
+        self.base_url = sec['base_url']
 
         if not isdir(self.base_data_dir):
             raise ValueError("The BASE_DATA_DIR (%s) folder doesn't exist" %
                              self.base_data_dir)
 
-        self.working_dir = config.get('main', 'WORKING_DIR')
+        self.working_dir = sec['working_dir']
         if not isdir(self.working_dir):
             raise ValueError("The WORKING_DIR (%s) folder doesn't exist" %
                              self.working_dir)
-        self.max_upload_size = config.getint('main', 'MAX_UPLOAD_SIZE')
-        self.require_approval = config.getboolean('main', 'REQUIRE_APPROVAL')
+        self.max_upload_size = int(sec['max_upload_size'])
+        self.require_approval = _to_bool(sec['require_approval'])
 
-        self.qiita_env = config.get('main', 'QIITA_ENV')
+        self.qiita_env = sec['qiita_env']
         if not self.qiita_env:
             self.qiita_env = ""
 
-        self.private_launcher = config.get('main', 'PRIVATE_LAUNCHER')
+        self.private_launcher = sec['private_launcher']
 
-        self.plugin_launcher = config.get('main', 'PLUGIN_LAUNCHER')
-        self.plugin_dir = config.get('main', 'PLUGIN_DIR')
+        self.plugin_launcher = sec['plugin_launcher']
+        self.plugin_dir = sec['plugin_dir']
         if not self.plugin_dir:
             self.plugin_dir = join(expanduser('~'), '.qiita_plugins')
             if not exists(self.plugin_dir):
@@ -206,41 +252,41 @@ class ConfigurationManager(object):
             raise ValueError("The PLUGIN_DIR (%s) folder doesn't exist"
                              % self.plugin_dir)
 
-        self.valid_upload_extension = [ve.strip() for ve in config.get(
-            'main', 'VALID_UPLOAD_EXTENSION').split(',')]
+        self.valid_upload_extension = [
+            ve.strip() for ve in sec['valid_upload_extension'].split(',')]
         if (not self.valid_upload_extension or
            self.valid_upload_extension == ['']):
             self.valid_upload_extension = []
             raise ValueError('No files will be allowed to be uploaded.')
 
-        self.certificate_file = config.get('main', 'CERTIFICATE_FILE')
+        self.certificate_file = sec['certificate_file']
         if not self.certificate_file:
             self.certificate_file = join(install_dir, 'qiita_core',
                                          'support_files', 'server.crt')
 
-        self.cookie_secret = config.get('main', 'COOKIE_SECRET')
+        self.cookie_secret = sec['cookie_secret']
         if not self.cookie_secret:
             self.cookie_secret = b64encode(uuid4().bytes + uuid4().bytes)
             warnings.warn("Random cookie secret generated.")
 
-        self.jwt_secret = config.get('main', 'JWT_SECRET')
+        self.jwt_secret = sec['jwt_secret']
         if not self.jwt_secret:
             self.jwt_secret = b64encode(uuid4().bytes + uuid4().bytes)
             warnings.warn("Random JWT secret generated.  Non Public Artifact "
                           "Download Links will expire upon system restart.")
 
-        self.key_file = config.get('main', 'KEY_FILE')
+        self.key_file = sec['key_file']
         if not self.key_file:
             self.key_file = join(install_dir, 'qiita_core', 'support_files',
                                  'server.key')
 
     def _get_torque(self, config):
         """Get the configuration of the torque section"""
-        self.trq_owner = config.get('torque', 'TORQUE_JOB_OWNER')
-        self.trq_poll_val = int(config.get('torque', 'TORQUE_POLLING_VALUE'))
-        self.trq_dependency_q_cnt = config.get('torque',
-                                               'TORQUE_PROCESSING_QUEUE_COUNT')
-        self.trq_dependency_q_cnt = int(self.trq_dependency_q_cnt)
+        sec = config['torque']
+
+        self.trq_owner = sec['torque_job_owner']
+        self.trq_poll_val = int(sec['torque_polling_value'])
+        self.trq_dependency_q_cnt = int(sec['torque_processing_queue_count'])
 
         if not self.trq_owner:
             self.trq_owner = None
@@ -253,62 +299,65 @@ class ConfigurationManager(object):
 
     def _get_postgres(self, config):
         """Get the configuration of the postgres section"""
-        self.user = config.get('postgres', 'USER')
-        self.admin_user = config.get('postgres', 'ADMIN_USER') or None
+        sec = config['postgres']
+
+        self.user = sec['user']
+        self.admin_user = sec['admin_user'] or None
 
-        self.password = config.get('postgres', 'PASSWORD')
+        self.password = sec['password']
         if not self.password:
             self.password = None
 
-        self.admin_password = config.get('postgres', 'ADMIN_PASSWORD')
+        self.admin_password = sec['admin_password']
         if not self.admin_password:
             self.admin_password = None
 
-        self.database = config.get('postgres', 'DATABASE')
-        self.host = config.get('postgres', 'HOST')
-        self.port = config.getint('postgres', 'PORT')
+        self.database = sec['database']
+        self.host = sec['host']
+        self.port = int(sec['port'])
 
     def _get_redis(self, config):
         """Get the configuration of the redis section"""
-        sec_get = partial(config.get, 'redis')
-        sec_getint = partial(config.getint, 'redis')
+        sec = config['redis']
 
-        self.redis_host = sec_get('HOST')
-        self.redis_password = sec_get('PASSWORD')
-        self.redis_db = sec_getint('DB')
-        self.redis_port = sec_getint('PORT')
+        self.redis_host = sec['host']
+        self.redis_password = sec['password']
+        self.redis_db = int(sec['db'])
+        self.redis_port = int(sec['port'])
 
     def _get_smtp(self, config):
-        sec_get = partial(config.get, 'smtp')
-        sec_getint = partial(config.getint, 'smtp')
-        sec_getbool = partial(config.getboolean, 'smtp')
+        sec = config['smtp']
 
-        self.smtp_host = sec_get("HOST")
-        self.smtp_port = sec_getint("PORT")
-        self.smtp_user = sec_get("USER")
-        self.smtp_password = sec_get("PASSWORD")
-        self.smtp_ssl = sec_getbool("SSL")
-        self.smtp_email = sec_get('EMAIL')
+        self.smtp_host = sec['host']
+        self.smtp_port = int(sec['port'])
+        self.smtp_user = sec['user']
+        self.smtp_password = sec['password']
+        self.smtp_ssl = _to_bool(sec['ssl'])
+        self.smtp_email = sec['email']
 
     def _get_ebi(self, config):
-        sec_get = partial(config.get, 'ebi')
+        sec = config['ebi']
 
-        self.ebi_seq_xfer_user = sec_get('EBI_SEQ_XFER_USER')
-        self.ebi_seq_xfer_pass = sec_get('EBI_SEQ_XFER_PASS')
-        self.ebi_seq_xfer_url = sec_get('EBI_SEQ_XFER_URL')
-        self.ebi_dropbox_url = sec_get('EBI_DROPBOX_URL')
-        self.ebi_center_name = sec_get('EBI_CENTER_NAME')
-        self.ebi_organization_prefix = sec_get('EBI_ORGANIZATION_PREFIX')
+        self.ebi_seq_xfer_user = sec['ebi_seq_xfer_user']
+        self.ebi_seq_xfer_pass = sec['ebi_seq_xfer_pass']
+        self.ebi_seq_xfer_url = sec['ebi_seq_xfer_url']
+        self.ebi_dropbox_url = sec['ebi_dropbox_url']
+        self.ebi_center_name = sec['ebi_center_name']
+        self.ebi_organization_prefix = sec['ebi_organization_prefix']
 
     def _get_vamps(self, config):
-        self.vamps_user = config.get('vamps', 'USER')
-        self.vamps_pass = config.get('vamps', 'PASSWORD')
-        self.vamps_url = config.get('vamps', 'URL')
+        sec = config['vamps']
+
+        self.vamps_user = sec['user']
+        self.vamps_pass = sec['password']
+        self.vamps_url = sec['url']
 
     def _get_portal(self, config):
-        self.portal_fp = config.get('portal', 'PORTAL_FP')
-        self.portal = config.get('portal', 'PORTAL')
-        self.portal_dir = config.get('portal', 'PORTAL_DIR')
+        sec = config['portal']
+
+        self.portal_fp = sec['portal_fp']
+        self.portal = sec['portal']
+        self.portal_dir = sec['portal_dir']
         if self.portal_dir:
             if not self.portal_dir.startswith('/'):
                 self.portal_dir = "/%s" % self.portal_dir
@@ -318,4 +367,4 @@ class ConfigurationManager(object):
             self.portal_dir = ""
 
     def _iframe(self, config):
-        self.iframe_qiimp = config.get('iframe', 'QIIMP')
+        self.iframe_qiimp = config['iframe']['qiimp']
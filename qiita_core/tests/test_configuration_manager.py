@@ -111,6 +111,15 @@ class ConfigurationManagerTests(TestCase):
         # iframe section
         self.assertEqual(obs.iframe_qiimp, "https://localhost:8898/")
 
+    def test_init_cached(self):
+        obs = ConfigurationManager()
+        self.assertIs(ConfigurationManager(), obs)
+
+        ConfigurationManager.reload()
+        new = ConfigurationManager()
+        self.assertIsNot(new, obs)
+        self.assertEqual(new.conf_fp, self.conf_fp)
+
     def test_init_error(self):
         with open(self.conf_fp, 'w') as f:
             f.write("\n")
@@ -63,6 +63,7 @@ class Analysis(qdb.base.QiitaObject):
     add_artifact
     set_error
     """
+    __slots__ = ()
 
     _table = "analysis"
     _portal_table = "analysis_portal"
@@ -243,6 +244,7 @@ class Analysis(qdb.base.QiitaObject):
             qdb.sql_connection.TRN.add(sql, args)
 
             qdb.sql_connection.TRN.execute()
+            qdb.base._forget_objects(cls, [_id])
 
     @classmethod
     def exists(cls, analysis_id):
@@ -746,7 +748,7 @@ class Analysis(qdb.base.QiitaObject):
                             (analysis_id, artifact_id, sample_id)
                          VALUES (%s, %s, %s)"""
                 args = [[self._id, aid, s] for s in select]
-                qdb.sql_connection.TRN.add(sql, args, many=True)
+                qdb.sql_connection.TRN.add(sql, args, many=True, batch=True)
                 qdb.sql_connection.TRN.execute()
 
     def remove_samples(self, artifacts=None, samples=None):
@@ -792,7 +794,7 @@ class Analysis(qdb.base.QiitaObject):
                     "Must provide list of samples and/or proc_data for "
                     "removal")
 
-            qdb.sql_connection.TRN.add(sql, args, many=True)
+            qdb.sql_connection.TRN.add(sql, args, many=True, batch=True)
             qdb.sql_connection.TRN.execute()
 
     def build_files(self, merge_duplicated_sample_ids):
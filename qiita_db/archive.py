@@ -22,6 +22,7 @@ class Archive(qdb.base.QiitaObject):
     --------
     qiita_db.QiitaObject
     """
+    __slots__ = ()
 
     @classmethod
     def merging_schemes(cls):
@@ -113,7 +114,10 @@ class Archive(qdb.base.QiitaObject):
                 If the artifact doesn't have a biom filepath
         """
         with qdb.sql_connection.TRN:
-            acmd = job.command
+            # The parameters already hold the command, no need to retrieve it
+            # again from the job
+            job_parameters = job.parameters
+            acmd = job_parameters.command
             parent = job.input_artifacts[0]
             parent_pparameters = parent.processing_parameters
             if parent_pparameters is None:
@@ -129,7 +133,7 @@ class Archive(qdb.base.QiitaObject):
             return qdb.util.human_merging_scheme(
                 acmd.name, acmd.merging_scheme,
                 parent_cmd_name, parent_merging_scheme,
-                job.parameters.values, [], parent_parameters)
+                job_parameters.values, [], parent_parameters)
 
     @classmethod
     def retrieve_feature_values(cls, archive_merging_scheme=None,
@@ -155,13 +159,15 @@ class Archive(qdb.base.QiitaObject):
                 extras.append("""archive_merging_scheme = %s""")
                 vals.append(archive_merging_scheme)
             if features is not None:
-                extras.append("""archive_feature IN %s""")
+                # the features are sent as a single array parameter, so an
+                # empty list of features is also valid SQL
+                extras.append("""archive_feature = ANY(%s)""")
                 # depending on the method calling test retrieve_feature_values
                 # the features elements can be string or bytes; making sure
-                # everything is string for SQL
-                vals.append(
-                    tuple([f.decode('ascii') if isinstance(f, bytes) else f
-                           for f in features]))
+                # everything is string for SQL, and removing duplicates
+                vals.append(list(dict.fromkeys(
+                    f.decode('ascii') if isinstance(f, bytes) else f
+                    for f in features)))
 
             sql = """SELECT archive_feature, archive_feature_value
                      FROM qiita.archive_feature_value
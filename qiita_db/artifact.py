@@ -29,6 +29,7 @@ class Artifact(qdb.base.QiitaObject):
 
     Attributes
     ----------
+    info
     timestamp
     processing_parameters
     visibility
@@ -47,12 +48,15 @@ class Artifact(qdb.base.QiitaObject):
     -------
     create
     delete
+    infos
     being_deleted_by
 
     See Also
     --------
     qiita_db.QiitaObject
     """
+    __slots__ = ()
+
     _table = "artifact"
 
     @classmethod
@@ -236,9 +240,8 @@ class Artifact(qdb.base.QiitaObject):
                 filepaths, a_id, atype, copy=True)
             sql = """INSERT INTO qiita.artifact_filepath
                         (artifact_id, filepath_id)
-                     VALUES (%s, %s)"""
-            sql_args = [[a_id, fp_id] for fp_id in fp_ids]
-            qdb.sql_connection.TRN.add(sql, sql_args, many=True)
+                     SELECT %s, unnest(%s::integer[])"""
+            qdb.sql_connection.TRN.add(sql, [a_id, fp_ids])
             qdb.sql_connection.TRN.execute()
 
         return instance
@@ -350,18 +353,22 @@ class Artifact(qdb.base.QiitaObject):
         # create function, hence declaring them here
         def _common_creation_steps(atype, cmd_id, data_type, cmd_parameters):
             gen_timestamp = datetime.now()
-            visibility_id = qdb.util.convert_to_id("sandbox", "visibility")
             atype_id = qdb.util.convert_to_id(atype, "artifact_type")
             dtype_id = qdb.util.convert_to_id(data_type, "data_type")
-            # Create the artifact row in the artifact table
+            # Create the artifact row in the artifact table. New artifacts
+            # are always sandboxed, so resolve its id in the same query
             sql = """INSERT INTO qiita.artifact
                         (generated_timestamp, command_id, data_type_id,
                          command_parameters, visibility_id,
                          artifact_type_id, submitted_to_vamps)
-                     VALUES (%s, %s, %s, %s, %s, %s, %s)
+                     VALUES (%s, %s, %s, %s,
+                             (SELECT visibility_id
+                              FROM qiita.visibility
+                              WHERE visibility = 'sandbox'),
+                             %s, %s)
                      RETURNING artifact_id"""
             sql_args = [gen_timestamp, cmd_id, dtype_id,
-                        cmd_parameters, visibility_id, atype_id, False]
+                        cmd_parameters, atype_id, False]
             qdb.sql_connection.TRN.add(sql, sql_args)
             a_id = qdb.sql_connection.TRN.execute_fetchlast()
             qdb.sql_connection.TRN.execute()
@@ -447,9 +454,9 @@ class Artifact(qdb.base.QiitaObject):
                 # Associate the artifact with its parents
                 sql = """INSERT INTO qiita.parent_artifact
                             (artifact_id, parent_id)
-                         VALUES (%s, %s)"""
-                sql_args = [(instance.id, p.id) for p in parents]
-                qdb.sql_connection.TRN.add(sql, sql_args, many=True)
+                         SELECT %s, unnest(%s::integer[])"""
+                qdb.sql_connection.TRN.add(
+                    sql, [instance.id, [p.id for p in parents]])
 
                 # inheriting visibility
                 visibilities = {a.visibility for a in instance.parents}
@@ -484,9 +491,8 @@ class Artifact(qdb.base.QiitaObject):
                 move_files=move_files, copy=(not move_files))
             sql = """INSERT INTO qiita.artifact_filepath
                         (artifact_id, filepath_id)
-                     VALUES (%s, %s)"""
-            sql_args = [[instance.id, fp_id] for fp_id in fp_ids]
-            qdb.sql_connection.TRN.add(sql, sql_args, many=True)
+                     SELECT %s, unnest(%s::integer[])"""
+            qdb.sql_connection.TRN.add(sql, [instance.id, fp_ids])
 
             if name:
                 instance.name = name
@@ -641,6 +647,7 @@ class Artifact(qdb.base.QiitaObject):
             # Delete the rows in the artifact table
             sql = "DELETE FROM qiita.artifact WHERE artifact_id IN %s"
             qdb.sql_connection.TRN.add(sql, [all_ids])
+            qdb.base._forget_objects(cls, all_ids)
 
     @property
     def name(self):
@@ -677,6 +684,76 @@ class Artifact(qdb.base.QiitaObject):
                  WHERE artifact_id = %s"""
         qdb.sql_connection.perform_as_transaction(sql, [value, self.id])
 
+    @classmethod
+    def infos(cls, ids):
+        """Dicts with the information stored in the rows of several artifacts
+
+        Parameters
+        ----------
+        ids : iterable of int
+            The artifact ids
+
+        Returns
+        -------
+        dict of {int: dict of {str: object}}
+            The `info` of each artifact, keyed by artifact id
+
+        Raises
+        ------
+        QiitaDBUnknownIDError
+            If any of `ids` does not correspond to any artifact
+
+        Notes
+        -----
+        The values of all the artifacts are retrieved with a single query, so
+        this should be used instead of `info` when walking over many artifacts
+        """
+        ids = tuple(set(ids))
+        if not ids:
+            return {}
+
+        with qdb.sql_connection.TRN:
+            sql = """SELECT artifact_id, a.name,
+                            a.generated_timestamp AS timestamp,
+                            visibility, artifact_type, data_type,
+                            can_be_submitted_to_vamps,
+                            a.submitted_to_vamps AS is_submitted_to_vamps
+                     FROM qiita.artifact a
+                        JOIN qiita.visibility USING (visibility_id)
+                        JOIN qiita.artifact_type USING (artifact_type_id)
+                        JOIN qiita.data_type USING (data_type_id)
+                     WHERE artifact_id IN %s"""
+            qdb.sql_connection.TRN.add(sql, [ids])
+            infos = {}
+            for row in qdb.sql_connection.TRN.execute_fetchindex():
+                info = dict(row)
+                infos[info.pop('artifact_id')] = info
+
+        missing = set(ids).difference(infos)
+        if missing:
+            raise qdb.exceptions.QiitaDBUnknownIDError(
+                ', '.join(map(str, sorted(missing))), cls._table)
+        return infos
+
+    @property
+    def info(self):
+        """Dict with the information stored in the artifact row
+
+        Returns
+        -------
+        dict of {str: object}
+            The artifact name, timestamp, visibility, artifact_type,
+            data_type, can_be_submitted_to_vamps and is_submitted_to_vamps
+
+        Notes
+        -----
+        The values are retrieved with a single query, so this should be used
+        instead of the properties with the same names when several of them
+        are needed. Note that is_submitted_to_vamps is returned even if the
+        artifact can't be submitted to VAMPS.
+        """
+        return self.infos([self.id])[self.id]
+
     @property
     def timestamp(self):
         """The timestamp when the artifact was generated
@@ -927,7 +1004,7 @@ class Artifact(qdb.base.QiitaObject):
                      VALUES (%s, %s, %s)"""
             sql_args = [[sample, self.id, accession]
                         for sample, accession in values.items()]
-            qdb.sql_connection.TRN.add(sql, sql_args, many=True)
+            qdb.sql_connection.TRN.add(sql, sql_args, many=True, batch=True)
             qdb.sql_connection.TRN.execute()
 
     @property
@@ -1075,9 +1152,8 @@ class Artifact(qdb.base.QiitaObject):
                 filepaths, self.id, self.artifact_type)
             sql = """INSERT INTO qiita.artifact_filepath
                         (artifact_id, filepath_id)
-                     VALUES (%s, %s)"""
-            sql_args = [[self.id, id_] for id_ in fp_ids]
-            qdb.sql_connection.TRN.add(sql, sql_args, many=True)
+                     SELECT %s, unnest(%s::integer[])"""
+            qdb.sql_connection.TRN.add(sql, [self.id, fp_ids])
             qdb.sql_connection.TRN.execute()
 
     @property
@@ -28,6 +28,65 @@ from qiita_core.qiita_settings import qiita_config
 import qiita_db as qdb
 
 
+# Objects that are known to exist (and to be accessible in the current portal)
+# in the ongoing transaction, keyed by the transaction. While serving a single
+# request the same objects are instantiated over and over again (e.g. a study
+# and its artifacts), so this avoids re-checking them on the DB. The cache is
+# dropped when the transaction is committed or rolled back, as other processes
+# are free to delete the objects afterwards.
+_EXISTING_OBJECTS = {}
+
+
+def _existing_objects():
+    """Returns the set of objects known to exist in the current transaction
+
+    Returns
+    -------
+    set of (type, object, str)
+        The (class, id, portal) of the objects already checked
+
+    Notes
+    -----
+    This function needs to be called inside the transaction context
+    """
+    trn = qdb.sql_connection.TRN
+    try:
+        return _EXISTING_OBJECTS[trn]
+    except KeyError:
+        existing = _EXISTING_OBJECTS[trn] = set()
+        trn.add_post_commit_func(_EXISTING_OBJECTS.pop, trn, None)
+        trn.add_post_rollback_func(_EXISTING_OBJECTS.pop, trn, None)
+        return existing
+
+
+def _forget_objects(cls, ids, portal=None):
+    """Removes the objects being deleted from the existing objects
+
+    Parameters
+    ----------
+    cls : type
+        The class of the objects
+    ids : iterable of object
+        The ids of the objects being deleted
+    portal : str, optional
+        If provided, the objects are only forgotten for this portal, as they
+        are being removed from it. Default: all portals
+
+    Notes
+    -----
+    This function needs to be called inside the transaction context, so
+    instantiating the deleted objects later in the same transaction raises
+    a QiitaDBUnknownIDError as expected
+    """
+    # Same ID normalization as done in QiitaObject.__init__
+    ids = {int(id_) if isinstance(id_, str) and id_.isdigit() else id_
+           for id_ in ids}
+    existing = _existing_objects()
+    existing.difference_update(
+        [key for key in existing
+         if key[0] is cls and key[1] in ids and portal in (None, key[2])])
+
+
 class QiitaObject(object):
     r"""Base class for any qiita_db object
 
@@ -45,8 +104,12 @@ class QiitaObject(object):
     create
     delete
     exists
+    from_ids
     _check_subclass
     _check_id
+    _check_ids
+    _check_portal
+    _check_id_and_portal
     __eq__
     __neq__
 
@@ -54,10 +117,51 @@ class QiitaObject(object):
     ------
     IncompetentQiitaDeveloperError
         If trying to instantiate the base class directly
+
+    Notes
+    -----
+    Lots of these objects can be instantiated while serving a single request,
+    so their attributes are stored in `__slots__`. Subclasses need to define
+    their own `__slots__`, listing any extra instance attribute. `__dict__` is
+    kept as a slot so ad-hoc attributes can still be set, but the instance
+    dictionary is only created when one is.
     """
+    __slots__ = ('_id', '__dict__')
 
     _table = None
     _portal_table = None
+    # SQL used to check if objects exist, built once per subclass
+    _check_id_sql = None
+    _check_ids_sql = None
+    _check_portal_sql = None
+    _check_id_and_portal_sql = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # The existence and portal checks run every time an object is
+        # instantiated, and their SQL only depends on the tables of the class
+        if cls._table is not None:
+            cls._check_id_sql = """SELECT EXISTS(
+                                    SELECT * FROM qiita.{0}
+                                    WHERE {0}_id=%s)""".format(cls._table)
+            cls._check_ids_sql = """SELECT {0}_id
+                                     FROM qiita.{0}
+                                     WHERE {0}_id IN %s""".format(cls._table)
+        if cls._portal_table is not None:
+            cls._check_portal_sql = """SELECT EXISTS(
+                        SELECT *
+                        FROM qiita.{0}
+                            JOIN qiita.portal_type USING (portal_type_id)
+                        WHERE {1}_id = %s AND portal = %s
+                    )""".format(cls._portal_table, cls._table)
+            cls._check_id_and_portal_sql = """SELECT EXISTS(
+                        SELECT * FROM qiita.{1} WHERE {1}_id = %s),
+                     EXISTS(
+                        SELECT *
+                        FROM qiita.{0}
+                            JOIN qiita.portal_type USING (portal_type_id)
+                        WHERE {1}_id = %s AND portal = %s)
+                  """.format(cls._portal_table, cls._table)
 
     @classmethod
     def create(cls):
@@ -83,6 +187,11 @@ class QiitaObject(object):
         ------
         QiitaDBNotImplementedError
             If the method is not overwritten by a subclass
+
+        Notes
+        -----
+        Subclasses need to call `_forget_objects` with the deleted ids, so
+        they are not considered existing in the rest of the transaction
         """
         raise qdb.exceptions.QiitaDBNotImplementedError()
 
@@ -127,12 +236,118 @@ class QiitaObject(object):
         subclass that doesn't follow this convention and it can override this.
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT EXISTS(
-                        SELECT * FROM qiita.{0}
-                        WHERE {0}_id=%s)""".format(self._table)
-            qdb.sql_connection.TRN.add(sql, [id_])
+            qdb.sql_connection.TRN.add(self._check_id_sql, [id_])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
+    @classmethod
+    def _check_ids(cls, ids):
+        r"""Check which of the provided IDs actually exist on the database
+
+        Parameters
+        ----------
+        ids : iterable of object
+            The IDs to test
+
+        Returns
+        -------
+        set of object
+            The subset of `ids` that exist on the database
+
+        Notes
+        -----
+        This is the batch version of `_check_id`: it checks all the IDs with a
+        single query, so it should be used when checking many objects at once.
+        As `_check_id`, subclasses that don't follow the standard sql layout
+        need to override it.
+        """
+        cls._check_subclass()
+        ids = tuple(ids)
+        if not ids:
+            return set()
+
+        with qdb.sql_connection.TRN:
+            qdb.sql_connection.TRN.add(cls._check_ids_sql, [ids])
+            return set(qdb.sql_connection.TRN.execute_fetchflatten())
+
+    @classmethod
+    def from_ids(cls, ids):
+        r"""Instantiates the objects with the given IDs
+
+        Parameters
+        ----------
+        ids : iterable of int, long, str, or unicode
+            The object identifiers
+
+        Returns
+        -------
+        list of QiitaObject
+            The objects, in the same order as `ids`
+
+        Raises
+        ------
+        IncompetentQiitaDeveloperError
+            If the class overrides how its objects are initialized
+        QiitaDBUnknownIDError
+            If any of `ids` does not correspond to any object
+        QiitaDBError
+            If any of the objects is not accessible in the current portal
+
+        Notes
+        -----
+        This is equivalent to `[cls(id_) for id_ in ids]`, but the existence
+        and portal checks are performed for all the objects at once instead
+        of once per object.
+        """
+        if cls.__init__ is not QiitaObject.__init__:
+            raise IncompetentQiitaDeveloperError(
+                "%s objects can't be instantiated in bulk" % cls.__name__)
+
+        # Same ID normalization as done in __init__
+        ids = [int(id_) if isinstance(id_, str) and id_.isdigit() else id_
+               for id_ in ids]
+        for id_ in ids:
+            if not isinstance(id_, (int, str)):
+                raise TypeError("id_ must be a numerical or text type (not "
+                                "%s) when instantiating %s"
+                                % (id_.__class__.__name__, cls.__name__))
+
+        portal = qiita_config.portal
+        with qdb.sql_connection.TRN:
+            existing = _existing_objects()
+            to_check = {id_ for id_ in ids
+                        if (cls, id_, portal) not in existing}
+            if to_check:
+                missing = to_check - cls._check_ids(to_check)
+                if missing:
+                    raise qdb.exceptions.QiitaDBUnknownIDError(
+                        ', '.join(map(str, sorted(missing))), cls._table)
+
+                if cls._portal_table is not None:
+                    sql = """SELECT {1}_id
+                             FROM qiita.{0}
+                                JOIN qiita.portal_type
+                                    USING (portal_type_id)
+                             WHERE {1}_id IN %s AND portal = %s""".format(
+                        cls._portal_table, cls._table)
+                    qdb.sql_connection.TRN.add(
+                        sql, [tuple(to_check), portal])
+                    inaccessible = to_check.difference(
+                        qdb.sql_connection.TRN.execute_fetchflatten())
+                    if inaccessible:
+                        raise qdb.exceptions.QiitaDBError(
+                            "%s with id %s inaccessible in current portal: %s"
+                            % (cls.__name__,
+                               ', '.join(map(str, sorted(inaccessible))),
+                               portal))
+                existing.update((cls, id_, portal) for id_ in to_check)
+
+        objs = []
+        for id_ in ids:
+            obj = cls.__new__(cls)
+            obj._id = id_
+            objs.append(obj)
+        return objs
+
     def _check_portal(self, id_):
         """Checks that object is accessible in current portal
 
@@ -146,15 +361,39 @@ class QiitaObject(object):
             return True
 
         with qdb.sql_connection.TRN:
-            sql = """SELECT EXISTS(
-                        SELECT *
-                        FROM qiita.{0}
-                            JOIN qiita.portal_type USING (portal_type_id)
-                        WHERE {1}_id = %s AND portal = %s
-                    )""".format(self._portal_table, self._table)
-            qdb.sql_connection.TRN.add(sql, [id_, qiita_config.portal])
+            qdb.sql_connection.TRN.add(
+                self._check_portal_sql, [id_, qiita_config.portal])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
+    def _check_id_and_portal(self, id_):
+        """Checks that the object exists and is accessible in current portal
+
+        Parameters
+        ----------
+        id_ : object
+            The ID to test
+
+        Returns
+        -------
+        (bool, bool)
+            Whether the object exists and whether it is accessible in the
+            current portal
+
+        Notes
+        -----
+        For portal limited objects both checks are performed with a single
+        query, otherwise this is equivalent to `_check_id`.
+        """
+        if self._portal_table is None:
+            # assume not portal limited object
+            return self._check_id(id_), True
+
+        with qdb.sql_connection.TRN:
+            qdb.sql_connection.TRN.add(self._check_id_and_portal_sql,
+                                       [id_, id_, qiita_config.portal])
+            exists, accessible = qdb.sql_connection.TRN.execute_fetchindex()[0]
+            return exists, accessible
+
     def __init__(self, id_):
         r"""Initializes the object
 
@@ -182,33 +421,42 @@ class QiitaObject(object):
             if id_.isdigit():
                 id_ = int(id_)
 
+        # Read the portal once, it is needed both for the cache key and for
+        # the error message
+        portal = qiita_config.portal
         with qdb.sql_connection.TRN:
-            self._check_subclass()
-            if not self._check_id(id_):
-                raise qdb.exceptions.QiitaDBUnknownIDError(id_, self._table)
-
-            if not self._check_portal(id_):
-                raise qdb.exceptions.QiitaDBError(
-                    "%s with id %d inaccessible in current portal: %s"
-                    % (self.__class__.__name__, id_, qiita_config.portal))
+            existing = _existing_objects()
+            key = (self.__class__, id_, portal)
+            # An object of a class can only be in the cache if the class
+            # already passed the subclass check
+            if key not in existing:
+                self._check_subclass()
+                exists, accessible = self._check_id_and_portal(id_)
+                if not exists:
+                    raise qdb.exceptions.QiitaDBUnknownIDError(
+                        id_, self._table)
+
+                if not accessible:
+                    raise qdb.exceptions.QiitaDBError(
+                        "%s with id %d inaccessible in current portal: %s"
+                        % (self.__class__.__name__, id_, portal))
+                existing.add(key)
 
         self._id = id_
 
     def __eq__(self, other):
         r"""Self and other are equal based on type and database id"""
-        if type(self) != type(other):
-            return False
-        if other._id != self._id:
+        if self.__class__ is not other.__class__:
             return False
-        return True
+        return self._id == other._id
 
     def __ne__(self, other):
         r"""Self and other are not equal based on type and database id"""
         return not self.__eq__(other)
 
     def __hash__(self):
-        r"""The hash of an object is based on the id"""
-        return hash(str(self.id))
+        r"""The hash of an object is based on its type and id"""
+        return hash((self.__class__, self._id))
 
     @property
     def id(self):
@@ -6,17 +6,21 @@
 # The full license is in the file LICENSE, distributed with this software.
 # -----------------------------------------------------------------------------
 
-from functools import partial
 from json import loads
+import re
+from os.path import getsize
 
 import qiita_db as qdb
 
-from configparser import ConfigParser
+from configparser import ConfigParser, NoOptionError
 
 
-SUPPORTED_PARAMS = ['preprocessed_sequence_illumina_params',
+SUPPORTED_PARAMS = ('preprocessed_sequence_illumina_params',
                     'preprocessed_sequence_454_params',
-                    'processed_params_sortmerna']
+                    'processed_params_sortmerna')
+
+# Separator of the fields of the people in the study configuration files
+_COMMA = re.compile(r'\s*,\s*')
 
 
 def load_study_from_cmd(owner, title, info):
@@ -32,16 +36,16 @@ def load_study_from_cmd(owner, title, info):
         File-like object containing study information
 
     """
-    # Parse the configuration file
-    config = ConfigParser()
-    config.readfp(info)
-
+    # Parse the configuration file. The values are used verbatim, so there
+    # is no need to interpolate them
+    config = ConfigParser(interpolation=None)
+    config.read_file(info)
+
+    # Read both sections at once, instead of going through the ConfigParser
+    # API for every field
+    required = dict(config.items('required'))
     optional = dict(config.items('optional'))
 
-    def get_optional(name):
-        return optional.get(name, None)
-
-    get_required = partial(config.get, 'required')
     required_fields = ['timeseries_type_id', 'mixs_compliant',
                        'reprocess', 'study_alias',
                        'study_description', 'study_abstract',
@@ -50,24 +54,30 @@ def load_study_from_cmd(owner, title, info):
                        'vamps_id', 'study_id']
     infodict = {}
     for value in required_fields:
-        infodict[value] = get_required(value)
+        try:
+            infodict[value] = required[value]
+        except KeyError:
+            raise NoOptionError(value, 'required')
 
     for value in optional_fields:
-        optvalue = get_optional(value)
-        if optvalue is not None:
-            infodict[value] = optvalue
+        if value in optional:
+            infodict[value] = optional[value]
 
     with qdb.sql_connection.TRN:
-        lab_name_email = get_optional('lab_person')
+        # The people are given as "name, email, affiliation", note that the
+        # affiliation can contain commas
+        lab_name_email = optional.get('lab_person')
         if lab_name_email is not None:
-            lab_name, lab_email, lab_affiliation = lab_name_email.split(',')
+            lab_name, lab_email, lab_affiliation = _COMMA.split(
+                lab_name_email.strip(), maxsplit=2)
             infodict['lab_person_id'] = qdb.study.StudyPerson.create(
-                lab_name.strip(), lab_email.strip(), lab_affiliation.strip())
+                lab_name, lab_email, lab_affiliation)
 
         pi_name_email = infodict.pop('principal_investigator')
-        pi_name, pi_email, pi_affiliation = pi_name_email.split(',', 2)
+        pi_name, pi_email, pi_affiliation = _COMMA.split(
+            pi_name_email.strip(), maxsplit=2)
         infodict['principal_investigator_id'] = qdb.study.StudyPerson.create(
-            pi_name.strip(), pi_email.strip(), pi_affiliation.strip())
+            pi_name, pi_email, pi_affiliation)
 
         return qdb.study.Study.create(qdb.user.User(owner), title, infodict)
 
@@ -124,7 +134,7 @@ def load_artifact_from_cmd(filepaths, filepath_types, artifact_type,
             if len(parents) > 1 and required_params is None:
                 raise ValueError("When you pass more than 1 parent you need "
                                  "to also pass required_params")
-            parents = [qdb.artifact.Artifact(pid) for pid in parents]
+            parents = qdb.artifact.Artifact.from_ids(parents)
 
         params = None
         if dflt_params_id:
@@ -197,6 +207,12 @@ def update_artifact_from_cmd(filepaths, filepath_types, artifact_id):
     ------
     ValueError
         If 'filepaths' and 'filepath_types' do not have the same length
+
+    Notes
+    -----
+    The files that are identical (same name, type and checksum) to the ones
+    already attached to the artifact are not replaced, and they are left in
+    their original location.
     """
     if len(filepaths) != len(filepath_types):
         raise ValueError("Please provide exactly one filepath_type for each "
@@ -204,19 +220,47 @@ def update_artifact_from_cmd(filepaths, filepath_types, artifact_id):
     with qdb.sql_connection.TRN:
         artifact = qdb.artifact.Artifact(artifact_id)
         fp_types_dict = qdb.util.get_filepath_types()
-        fps = [(fp, fp_types_dict[ftype])
-               for fp, ftype in zip(filepaths, filepath_types)]
-        old_fps = artifact.filepaths
-        sql = "DELETE FROM qiita.artifact_filepath WHERE artifact_id = %s"
-        qdb.sql_connection.TRN.add(sql, [artifact.id])
-        qdb.sql_connection.TRN.execute()
-        qdb.util.move_filepaths_to_upload_folder(artifact.study.id, old_fps)
-        fp_ids = qdb.util.insert_filepaths(
-            fps, artifact.id, artifact.artifact_type)
-        sql = """INSERT INTO qiita.artifact_filepath (artifact_id, filepath_id)
-                 VALUES (%s, %s)"""
-        sql_args = [[artifact.id, fp_id] for fp_id in fp_ids]
-        qdb.sql_connection.TRN.add(sql, sql_args, many=True)
-        qdb.sql_connection.TRN.execute()
+        old_fps = {(x['fp'], x['fp_type']): x for x in artifact.filepaths}
+        stored_fps = qdb.util.get_stored_filepaths(
+            filepaths, artifact.id, artifact.artifact_type)
+
+        # Files that are already stored with the same name, type and contents
+        # are left untouched, so we don't move (potentially large) files
+        # around when nothing changed
+        fps = []
+        for fp, stored_fp, ftype in zip(
+                filepaths, stored_fps, filepath_types):
+            key = (stored_fp, ftype)
+            old = old_fps.get(key)
+            # Compare the sizes first, so the checksum is only computed for
+            # the files that can be identical
+            if old is not None and old['fp_size'] == getsize(fp):
+                # Compare with the type used to store the checksum (text)
+                checksum = qdb.util.compute_checksum(fp)
+                if type(old['checksum'])(checksum) == old['checksum']:
+                    del old_fps[key]
+                    continue
+            fps.append((fp, fp_types_dict[ftype]))
+
+        if old_fps:
+            old_fps = list(old_fps.values())
+            sql = """DELETE FROM qiita.artifact_filepath
+                     WHERE artifact_id = %s AND filepath_id IN %s"""
+            qdb.sql_connection.TRN.add(
+                sql, [artifact.id, tuple(x['fp_id'] for x in old_fps)])
+            qdb.sql_connection.TRN.execute()
+            qdb.util.move_filepaths_to_upload_folder(
+                artifact.study.id, old_fps)
+
+        if fps:
+            fp_ids = qdb.util.insert_filepaths(
+                fps, artifact.id, artifact.artifact_type)
+            # Link all the files with a single statement, instead of one per
+            # file
+            sql = """INSERT INTO qiita.artifact_filepath
+                        (artifact_id, filepath_id)
+                     SELECT %s, unnest(%s::integer[])"""
+            qdb.sql_connection.TRN.add(sql, [artifact.id, fp_ids])
+            qdb.sql_connection.TRN.execute()
 
     return artifact
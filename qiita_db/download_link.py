@@ -26,6 +26,7 @@ class DownloadLink(qdb.base.QiitaObject):
     --------
     qiita_db.QiitaObject
     """
+    __slots__ = ()
 
     _table = "download_link"
 
@@ -72,8 +73,11 @@ class DownloadLink(qdb.base.QiitaObject):
         jti : object
             The jwt token identifier
         """
-        sql = """DELETE FROM qiita.{0} WHERE jti=%s""".format(cls._table)
-        qdb.sql_connection.perform_as_transaction(sql, [jti])
+        with qdb.sql_connection.TRN:
+            sql = """DELETE FROM qiita.{0} WHERE jti=%s""".format(cls._table)
+            qdb.sql_connection.TRN.add(sql, [jti])
+            qdb.sql_connection.TRN.execute()
+            qdb.base._forget_objects(cls, [jti])
 
     @classmethod
     def exists(cls, jti):
@@ -96,8 +100,12 @@ class DownloadLink(qdb.base.QiitaObject):
         r"""Deletes all expired download links"""
         now = datetime.now(timezone.utc)
 
-        sql = """DELETE FROM qiita.{0} WHERE exp<%s""".format(cls._table)
-        qdb.sql_connection.perform_as_transaction(sql, [now])
+        with qdb.sql_connection.TRN:
+            sql = """DELETE FROM qiita.{0} WHERE exp<%s
+                     RETURNING jti""".format(cls._table)
+            qdb.sql_connection.TRN.add(sql, [now])
+            qdb.base._forget_objects(
+                cls, qdb.sql_connection.TRN.execute_fetchflatten())
 
     @classmethod
     def get(cls, jti):
@@ -8,10 +8,12 @@
 
 from os.path import abspath, dirname, join, exists, basename, splitext
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from os import mkdir
 import gzip
 from glob import glob
 from natsort import natsorted
+from psycopg2.sql import SQL, Identifier
 
 from qiita_core.exceptions import QiitaEnvironmentError
 from qiita_core.qiita_settings import qiita_config, r_client
@@ -107,6 +109,14 @@ def _download_reference_files():
                           'ftp://ftp.microbio.me/greengenes_release/'
                           'gg_13_8_otus/rep_set/97_otus.fasta')}
 
+    def _download(file_type, local_fp, url):
+        try:
+            urlretrieve(url, local_fp)
+        except Exception:
+            raise IOError("Error: Could not fetch %s file from %s" %
+                          (file_type, url))
+
+    to_download = []
     for file_type, (local_fp, url) in files.items():
         # Do not download the file if it exists already
         if exists(local_fp):
@@ -114,11 +124,16 @@ def _download_reference_files():
                   "download the file again, erase the existing file first" %
                   (file_type, local_fp))
         else:
-            try:
-                urlretrieve(url, local_fp)
-            except Exception:
-                raise IOError("Error: Could not fetch %s file from %s" %
-                              (file_type, url))
+            to_download.append((file_type, local_fp, url))
+
+    # The files are independent and the downloads are network bound, so
+    # fetch them at the same time
+    if to_download:
+        with ThreadPoolExecutor(max_workers=len(to_download)) as pool:
+            downloads = [pool.submit(_download, *args)
+                         for args in to_download]
+        for download in downloads:
+            download.result()
     with qdb.sql_connection.TRN:
         ref = qdb.reference.Reference.create(
             'Greengenes', '13_8', files['sequence'][0],
@@ -170,7 +185,8 @@ def make_environment(load_ontologies, download_reference, add_demo_user):
     try:
         with qdb.sql_connection.TRNADMIN:
             qdb.sql_connection.TRNADMIN.add(
-                'CREATE DATABASE %s' % qiita_config.database)
+                SQL('CREATE DATABASE {}').format(
+                    Identifier(qiita_config.database)))
             qdb.sql_connection.TRNADMIN.execute()
         qdb.sql_connection.TRN.close()
     except ValueError as error:
@@ -297,7 +313,8 @@ def drop_environment(ask_for_confirmation):
     if do_drop:
         with qdb.sql_connection.TRNADMIN:
             qdb.sql_connection.TRNADMIN.add(
-                'DROP DATABASE %s' % qiita_config.database)
+                SQL('DROP DATABASE {}').format(
+                    Identifier(qiita_config.database)))
             qdb.sql_connection.TRNADMIN.execute()
     else:
         print('ABORTING')
@@ -418,6 +435,8 @@ def patch(patches_dir=PATCHES_DIR, verbose=False, test=False):
                     patch_update_sql, [sql_patch_filename])
 
             qdb.sql_connection.TRN.execute()
+            # The patch can modify the vocabulary tables
+            qdb.util._get_vocabulary.cache_clear()
 
             if exists(py_patch_fp):
                 if verbose:
@@ -82,15 +82,17 @@ class ArtifactHandler(OauthBaseHandler):
             artifact = _get_artifact(artifact_id)
             study = artifact.study
             analysis = artifact.analysis
+            # retrieve all the values stored in the artifact row at once
+            info = artifact.info
             response = {
-                'name': artifact.name,
-                'timestamp': str(artifact.timestamp),
-                'visibility': artifact.visibility,
-                'type': artifact.artifact_type,
-                'data_type': artifact.data_type,
+                'name': info['name'],
+                'timestamp': str(info['timestamp']),
+                'visibility': info['visibility'],
+                'type': info['artifact_type'],
+                'data_type': info['data_type'],
                 'can_be_submitted_to_ebi': artifact.can_be_submitted_to_ebi,
                 'can_be_submitted_to_vamps':
-                    artifact.can_be_submitted_to_vamps,
+                    info['can_be_submitted_to_vamps'],
                 'prep_information': [p.id for p in artifact.prep_templates],
                 'study': study.id if study else None,
                 'analysis': analysis.id if analysis else None}
@@ -102,7 +104,7 @@ class ArtifactHandler(OauthBaseHandler):
                 artifact.ebi_run_accessions
                 if response['can_be_submitted_to_ebi'] else None)
             response['is_submitted_to_vamps'] = (
-                artifact.is_submitted_to_vamps
+                info['is_submitted_to_vamps']
                 if response['can_be_submitted_to_vamps'] else None)
 
             # Instead of sending a list of files, provide the files as a
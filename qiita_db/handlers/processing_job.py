@@ -7,6 +7,7 @@
 # -----------------------------------------------------------------------------
 
 from json import loads
+from uuid import UUID
 
 from tornado.web import HTTPError
 
@@ -34,11 +35,17 @@ def _get_job(job_id):
         If there is a problem instantiating the processing job, with error
         code 500
     """
-    if not qdb.processing_job.ProcessingJob.exists(job_id):
+    # Job ids are UUIDs, anything else can't be a job. Otherwise, the
+    # existence of the job is checked when instantiating it
+    try:
+        UUID(job_id)
+    except ValueError:
         raise HTTPError(404)
 
     try:
         job = qdb.processing_job.ProcessingJob(job_id)
+    except qdb.exceptions.QiitaDBUnknownIDError:
+        raise HTTPError(404)
     except Exception as e:
         raise HTTPError(500, reason='Error instantiating the job: %s' % str(e))
 
@@ -68,8 +75,11 @@ class JobHandler(OauthBaseHandler):
         """
         with qdb.sql_connection.TRN:
             job = _get_job(job_id)
-            cmd = job.command.name
-            params = job.parameters.values
+            # The parameters already hold the command, no need to retrieve it
+            # again from the job
+            parameters = job.parameters
+            cmd = parameters.command.name
+            params = parameters.values
             status = job.status
 
         response = {'command': cmd, 'parameters': params,
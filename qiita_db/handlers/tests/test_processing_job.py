@@ -33,6 +33,11 @@ class UtilTests(TestCase):
         with self.assertRaises(HTTPError):
             _get_job('do-not-exist')
 
+        # A valid UUID that doesn't correspond to any job
+        with self.assertRaises(HTTPError) as e:
+            _get_job('00000000-0000-0000-0000-000000000000')
+        self.assertEqual(e.exception.status_code, 404)
+
 
 class JobHandlerTests(OauthTestingBase):
     def test_get_job_does_not_exists(self):
@@ -40,6 +40,8 @@ class Investigation(qdb.base.QiitaObject):
     add_study
         Adds a study to the investigation
     """
+    __slots__ = ()
+
     _table = "investigation"
 
     @classmethod
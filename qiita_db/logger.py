@@ -41,6 +41,7 @@ class LogEntry(qdb.base.QiitaObject):
     clear_info
     add_info
     """
+    __slots__ = ()
 
     _table = 'logging'
 
@@ -37,11 +37,12 @@ Methods
 from itertools import chain
 from copy import deepcopy
 from datetime import datetime
-from json import loads, dumps
+from json import dumps
+from io import StringIO
+import csv
 
 import pandas as pd
 import numpy as np
-from skbio.util import find_duplicates
 import warnings
 
 from qiita_core.exceptions import IncompetentQiitaDeveloperError
@@ -55,17 +56,169 @@ from string import ascii_letters, digits
 QIITA_COLUMN_NAME = 'qiita_sample_column_names'
 
 
+# What is already known of the info files in the ongoing transaction, keyed
+# by the transaction and then by the dynamic table: the rows retrieved, keyed
+# by sample id, and the sample ids of the template. Every access to a sample
+# (e.g. sample[column]) needs its values and the columns of its info file
+# (stored in the QIITA_COLUMN_NAME row), and every access to a template needs
+# its sample ids, so this avoids retrieving them over and over again while
+# serving a single request. As with the existing objects, the cache is
+# dropped when the transaction is committed or rolled back.
+_INFO_FILES = {}
+
+
+def _cached_info_file(table):
+    """Returns what is known of the info file `table` in the transaction
+
+    Parameters
+    ----------
+    table : str
+        The dynamic table of the info file
+
+    Returns
+    -------
+    dict
+        The sample values of the rows already retrieved, keyed by sample id,
+        under 'values' and the sample ids of the template (or None if not
+        retrieved yet) under 'sample_ids'
+
+    Notes
+    -----
+    This function needs to be called inside the transaction context
+    """
+    trn = qdb.sql_connection.TRN
+    try:
+        cached = _INFO_FILES[trn]
+    except KeyError:
+        cached = _INFO_FILES[trn] = {}
+        trn.add_post_commit_func(_INFO_FILES.pop, trn, None)
+        trn.add_post_rollback_func(_INFO_FILES.pop, trn, None)
+    try:
+        return cached[table]
+    except KeyError:
+        info_file = cached[table] = {'values': {}, 'sample_ids': None}
+        return info_file
+
+
+def _forget_info_file(table):
+    """Drops the cached information of `table` as it is being modified
+
+    Parameters
+    ----------
+    table : str
+        The dynamic table of the info file
+    """
+    with qdb.sql_connection.TRN:
+        cached = _INFO_FILES.get(qdb.sql_connection.TRN)
+        if cached is not None:
+            cached.pop(table, None)
+
+
+def _helper_get_sample_values(table, sample_id):
+    """Returns the values stored for `sample_id` in the info file `table`
+
+    Parameters
+    ----------
+    table : str
+        The dynamic table of the info file
+    sample_id : str
+        The sample id
+
+    Returns
+    -------
+    dict or None
+        The sample values, None if the sample is not in the info file. It
+        is shared with the cache, so it should not be modified
+    """
+    with qdb.sql_connection.TRN:
+        cached = _cached_info_file(table)['values']
+        if sample_id not in cached:
+            sql = """SELECT sample_values
+                     FROM qiita.{0}
+                     WHERE sample_id = %s""".format(table)
+            qdb.sql_connection.TRN.add(sql, [sample_id])
+            results = qdb.sql_connection.TRN.execute_fetchflatten()
+            if not results:
+                return None
+            cached[sample_id] = results[0]
+        return cached[sample_id]
+
+
+def _sample_values_to_json(md_template):
+    """Serializes the values of each sample in `md_template` as JSON
+
+    Parameters
+    ----------
+    md_template : DataFrame
+        The metadata indexed by sample ids
+
+    Returns
+    -------
+    iterable of (str, str)
+        The sample ids and their values, serialized as JSON
+
+    Notes
+    -----
+    All the rows are serialized by pandas at once, instead of building a
+    Series for each row, which is the slow part of `DataFrame.iterrows`
+    """
+    # the strings in the JSON lines can't contain a raw line break, and zip
+    # drops the empty line that some pandas versions add at the end
+    lines = md_template.to_json(orient='records', lines=True).split('\n')
+    return zip(md_template.index, lines)
+
+
+def _copy_sample_values(table, md_template):
+    """Inserts the samples of `md_template` in the info file `table` with a
+    single COPY
+
+    Parameters
+    ----------
+    table : str
+        The dynamic table of the info file
+    md_template : DataFrame
+        The metadata indexed by sample ids
+    """
+    data = StringIO()
+    csv.writer(data, lineterminator='\n').writerows(
+        _sample_values_to_json(md_template))
+    data.seek(0)
+    sql = """COPY qiita.{0} (sample_id, sample_values)
+             FROM STDIN WITH (FORMAT CSV)""".format(table)
+    with qdb.sql_connection.TRN:
+        qdb.sql_connection.TRN.copy_expert(sql, data)
+
+
+def _update_sample_values(table, values):
+    """Adds or replaces values of several samples with a single query
+
+    Parameters
+    ----------
+    table : str
+        The dynamic table of the info file
+    values : iterable of (str, str)
+        The sample ids and the values to set, serialized as JSON. The keys
+        not present in the given values are left untouched
+    """
+    sample_ids = []
+    sample_values = []
+    for sid, vals in values:
+        sample_ids.append(sid)
+        sample_values.append(vals)
+    # Remember that || is a jsonb to update or add a new key/value
+    sql = """UPDATE qiita.{0} AS t
+             SET sample_values = t.sample_values || c.sample_values
+             FROM unnest(%s::varchar[], %s::jsonb[])
+                AS c(sample_id, sample_values)
+             WHERE t.sample_id = c.sample_id""".format(table)
+    with qdb.sql_connection.TRN:
+        qdb.sql_connection.TRN.add(sql, [sample_ids, sample_values])
+
+
 def _helper_get_categories(table):
     """This is a helper function to avoid duplication of code"""
-    with qdb.sql_connection.TRN:
-        sql = """SELECT sample_values->>'columns'
-                 FROM qiita.{0}
-                 WHERE sample_id = '{1}'""".format(table, QIITA_COLUMN_NAME)
-        qdb.sql_connection.TRN.add(sql)
-        results = qdb.sql_connection.TRN.execute_fetchflatten()
-        if results:
-            results = sorted(loads(results[0]))
-        return results
+    values = _helper_get_sample_values(table, QIITA_COLUMN_NAME)
+    return sorted(values['columns']) if values else []
 
 
 class BaseSample(qdb.base.QiitaObject):
@@ -100,6 +253,8 @@ class BaseSample(qdb.base.QiitaObject):
     Sample
     PrepSample
     """
+    __slots__ = ('_md_template', '_dynamic_table')
+
     # Used to find the right SQL tables - should be defined on the subclasses
     _table_prefix = None
     _id_column = None
@@ -207,15 +362,8 @@ class BaseSample(qdb.base.QiitaObject):
         dict of {str: str}
             A dictionary of the form {category: value}
         """
-        with qdb.sql_connection.TRN:
-            sql = """SELECT sample_values
-                     FROM qiita.{0}
-                     WHERE sample_id=%s""".format(self._dynamic_table)
-            qdb.sql_connection.TRN.add(sql, [self._id])
-
-            result = qdb.sql_connection.TRN.execute_fetchindex()
-
-            return result[0]['sample_values']
+        return dict(
+            _helper_get_sample_values(self._dynamic_table, self._id) or {})
 
     def __len__(self):
         r"""Returns the number of metadata categories
@@ -258,13 +406,12 @@ class BaseSample(qdb.base.QiitaObject):
                     "Metadata category %s does not exists for sample %s"
                     " in template %d" % (key, self._id, self._md_template.id))
 
-            sql = """SELECT sample_values->>'{0}' as {0}
-                     FROM qiita.{1}
-                     WHERE sample_id = %s""".format(
-                key, self._dynamic_table)
-            qdb.sql_connection.TRN.add(sql, [self._id])
-
-            return qdb.sql_connection.TRN.execute_fetchlast()
+            value = (_helper_get_sample_values(
+                self._dynamic_table, self._id) or {}).get(key)
+            # Return the value as text, as done by the ->> operator of jsonb
+            if value is None or isinstance(value, str):
+                return value
+            return dumps(value)
 
     def setitem(self, column, value):
         """Sets `value` as value for the given `column`
@@ -292,8 +439,10 @@ class BaseSample(qdb.base.QiitaObject):
                  SET sample_values = sample_values || %s
                  WHERE sample_id = %s""".format(self._dynamic_table)
 
-        qdb.sql_connection.perform_as_transaction(
-            sql, [dumps({column: value}), self.id])
+        with qdb.sql_connection.TRN:
+            _forget_info_file(self._dynamic_table)
+            qdb.sql_connection.perform_as_transaction(
+                sql, [dumps({column: value}), self.id])
 
     def __setitem__(self, column, value):
         r"""Sets the metadata value for the category `column`
@@ -444,6 +593,7 @@ class MetadataTemplate(qdb.base.QiitaObject):
     SampleTemplate
     PrepTemplate
     """
+    __slots__ = ()
 
     # Used to find the right SQL tables - should be defined on the subclasses
     _table_prefix = None
@@ -461,6 +611,20 @@ class MetadataTemplate(qdb.base.QiitaObject):
             qdb.sql_connection.TRN.add(sql, [id_])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
+    @classmethod
+    def _check_ids(cls, ids):
+        r"""Checks which of the MetadataTemplate ids exist on the database"""
+        cls._check_subclass()
+        ids = tuple(ids)
+        if not ids:
+            return set()
+
+        with qdb.sql_connection.TRN:
+            sql = "SELECT DISTINCT {1} FROM qiita.{0} WHERE {1} IN %s".format(
+                cls._table, cls._id_column)
+            qdb.sql_connection.TRN.add(sql, [ids])
+            return set(qdb.sql_connection.TRN.execute_fetchflatten())
+
     @classmethod
     def _table_name(cls, obj_id):
         r"""Returns the dynamic table name
@@ -523,9 +687,10 @@ class MetadataTemplate(qdb.base.QiitaObject):
                 "characters (only alphanumeric characters or periods are "
                 "allowed): %s." % ", ".join(invalid_ids))
 
-        if len(set(md_template.index)) != len(md_template.index):
+        duplicated = md_template.index.duplicated()
+        if duplicated.any():
             raise qdb.exceptions.QiitaDBDuplicateSamplesError(
-                find_duplicates(md_template.index))
+                md_template.index[duplicated].unique().tolist())
 
         # We are going to modify the md_template. We create a copy so
         # we don't modify the user one
@@ -582,9 +747,10 @@ class MetadataTemplate(qdb.base.QiitaObject):
                                                                study_id)
 
         # Check that we don't have duplicate columns
-        if len(set(md_template.columns)) != len(md_template.columns):
+        duplicated = md_template.columns.duplicated()
+        if duplicated.any():
             raise qdb.exceptions.QiitaDBDuplicateHeaderError(
-                find_duplicates(md_template.columns))
+                md_template.columns[duplicated].unique().tolist())
 
         return md_template
 
@@ -608,14 +774,15 @@ class MetadataTemplate(qdb.base.QiitaObject):
             if not headers:
                 raise ValueError("Your info file only has sample_name")
 
-            # Insert values on template_sample table
-            values = [[obj_id, s_id] for s_id in sample_ids]
+            # Insert values on template_sample table, all the samples at once
             sql = """INSERT INTO qiita.{0} ({1}, sample_id)
-                     VALUES (%s, %s)""".format(cls._table, cls._id_column)
-            qdb.sql_connection.TRN.add(sql, values, many=True)
+                     SELECT %s, unnest(%s::varchar[])""".format(
+                cls._table, cls._id_column)
+            qdb.sql_connection.TRN.add(sql, [obj_id, sample_ids])
 
             # Create table with custom columns
             table_name = cls._table_name(obj_id)
+            _forget_info_file(table_name)
             sql = """CREATE TABLE qiita.{0} (
                         sample_id VARCHAR NOT NULL PRIMARY KEY,
                         sample_values JSONB NOT NULL)""".format(table_name)
@@ -627,10 +794,7 @@ class MetadataTemplate(qdb.base.QiitaObject):
                         table_name, QIITA_COLUMN_NAME)
             qdb.sql_connection.TRN.add(sql, [values])
 
-            values = [(k, df.to_json()) for k, df in md_template.iterrows()]
-            sql = """INSERT INTO qiita.{0} (sample_id, sample_values)
-                     VALUES (%s, %s)""".format(table_name)
-            qdb.sql_connection.TRN.add(sql, values, many=True)
+            _copy_sample_values(table_name, md_template)
 
             # Execute all the steps
             qdb.sql_connection.TRN.execute()
@@ -657,17 +821,16 @@ class MetadataTemplate(qdb.base.QiitaObject):
                         cls._table_prefix)
             qdb.sql_connection.TRN.add(sql)
             tables = qdb.sql_connection.TRN.execute_fetchflatten()
-            sql = """SELECT sample_values->>'columns'
-                     FROM qiita.%s WHERE sample_id = '{0}'""".format(
-                        QIITA_COLUMN_NAME)
-            results = []
-            for t in tables:
-                qdb.sql_connection.TRN.add(sql % t)
-                vals = qdb.sql_connection.TRN.execute_fetchflatten()
-                if vals:
-                    results.extend(loads(vals[0]))
-
-            return list(set(results))
+            if not tables:
+                return []
+
+            # Retrieve the columns of all the info files with a single query,
+            # UNION takes care of removing the duplicated headers
+            sql = """SELECT jsonb_array_elements_text(sample_values->'columns')
+                     FROM qiita.{0} WHERE sample_id = '{1}'"""
+            qdb.sql_connection.TRN.add('%s ORDER BY 1' % ' UNION '.join(
+                sql.format(t, QIITA_COLUMN_NAME) for t in tables))
+            return qdb.sql_connection.TRN.execute_fetchflatten()
 
     def _common_delete_sample_steps(self, sample_names):
         r"""Executes the common delete sample steps
@@ -701,6 +864,7 @@ class MetadataTemplate(qdb.base.QiitaObject):
                 qdb.sql_connection.TRN.add(sql1, [sn])
                 qdb.sql_connection.TRN.add(sql2, [sn, self.id])
             qdb.sql_connection.TRN.execute()
+            _forget_info_file(self._table_name(self._id))
 
             # making sure we don't delete all the samples
             qdb.sql_connection.TRN.add(
@@ -759,6 +923,7 @@ class MetadataTemplate(qdb.base.QiitaObject):
             # deleting from QIITA_COLUMN_NAME
             columns = self.categories
             columns.remove(column_name)
+            _forget_info_file(self._table_name(self._id))
             values = '{"columns": %s}' % dumps(columns)
             sql = """UPDATE {0}
                      SET sample_values = %s
@@ -844,7 +1009,8 @@ class MetadataTemplate(qdb.base.QiitaObject):
 
             # Check if we are adding new columns
             headers = md_template.keys().tolist()
-            new_cols = set(headers).difference(self.categories)
+            categories = self.categories
+            new_cols = set(headers).difference(categories)
 
             if not new_cols and not new_samples:
                 return None, None
@@ -865,8 +1031,8 @@ class MetadataTemplate(qdb.base.QiitaObject):
                 # code). Sorting the new columns to enforce an order
                 new_cols = sorted(new_cols)
 
-                cols = self.categories
-                cols.extend(new_cols)
+                cols = categories + new_cols
+                _forget_info_file(table_name)
 
                 values = dumps({"columns": cols})
                 sql = """UPDATE qiita.{0}
@@ -878,16 +1044,11 @@ class MetadataTemplate(qdb.base.QiitaObject):
                 if existing_samples:
                     # The values for the new columns are the only ones that get
                     # added to the database. None of the existing values will
-                    # be modified (see update for that functionality). Remember
-                    # that || is a jsonb to update or add a new key/value
-                    md_filtered = md_template[new_cols].loc[existing_samples]
-                    for sid, df in md_filtered.iterrows():
-                        values = dict(df.items())
-                        sql = """UPDATE qiita.{0}
-                                 SET sample_values = sample_values || %s
-                                 WHERE sample_id = %s""".format(
-                                    self._table_name(self._id))
-                        qdb.sql_connection.TRN.add(sql, [dumps(values), sid])
+                    # be modified (see update for that functionality)
+                    md_filtered = md_template.loc[
+                        sorted(existing_samples), new_cols]
+                    _update_sample_values(
+                        table_name, _sample_values_to_json(md_filtered))
 
             if new_samples:
                 warnings.warn(
@@ -896,24 +1057,20 @@ class MetadataTemplate(qdb.base.QiitaObject):
                     qdb.exceptions.QiitaDBWarning)
 
                 new_samples = sorted(new_samples)
+                _forget_info_file(table_name)
 
                 # At this point we only want the information
                 # from the new samples
                 md_filtered = md_template.loc[new_samples]
 
                 # Insert new samples to the study sample table
-                values = [[self._id, s_id] for s_id in new_samples]
                 sql = """INSERT INTO qiita.{0} ({1}, sample_id)
-                         VALUES (%s, %s)""".format(self._table,
-                                                   self._id_column)
-                qdb.sql_connection.TRN.add(sql, values, many=True)
+                         SELECT %s, unnest(%s::varchar[])""".format(
+                    self._table, self._id_column)
+                qdb.sql_connection.TRN.add(sql, [self._id, new_samples])
 
                 # inserting new samples to the info file
-                values = [(k, row.to_json())
-                          for k, row in md_filtered.iterrows()]
-                sql = """INSERT INTO qiita.{0} (sample_id, sample_values)
-                         VALUES (%s, %s)""".format(table_name)
-                qdb.sql_connection.TRN.add(sql, values, many=True)
+                _copy_sample_values(table_name, md_filtered)
 
             # Execute all the steps
             qdb.sql_connection.TRN.execute()
@@ -942,14 +1099,18 @@ class MetadataTemplate(qdb.base.QiitaObject):
 
         Returns
         -------
-        set of str
+        frozenset of str
             The set of all available sample ids
         """
         with qdb.sql_connection.TRN:
-            sql = "SELECT sample_id FROM qiita.{0} WHERE {1}=%s".format(
-                self._table, self._id_column)
-            qdb.sql_connection.TRN.add(sql, [self._id])
-            return set(qdb.sql_connection.TRN.execute_fetchflatten())
+            cached = _cached_info_file(self._table_name(self._id))
+            if cached['sample_ids'] is None:
+                sql = "SELECT sample_id FROM qiita.{0} WHERE {1}=%s".format(
+                    self._table, self._id_column)
+                qdb.sql_connection.TRN.add(sql, [self._id])
+                cached['sample_ids'] = frozenset(
+                    qdb.sql_connection.TRN.execute_fetchflatten())
+            return cached['sample_ids']
 
     def __len__(self):
         r"""Returns the number of samples in the metadata template
@@ -1064,9 +1225,7 @@ class MetadataTemplate(qdb.base.QiitaObject):
         Iterator
             Iterator over Sample obj
         """
-        with qdb.sql_connection.TRN:
-            return iter(self._sample_cls(sample_id, self)
-                        for sample_id in self._get_sample_ids())
+        return iter([sample for _, sample in self._get_samples()])
 
     def items(self):
         r"""Iterator over (sample_id, values) tuples, in sample id order
@@ -1076,9 +1235,43 @@ class MetadataTemplate(qdb.base.QiitaObject):
         Iterator
             Iterator over (sample_ids, values) tuples
         """
+        return iter(self._get_samples())
+
+    def _get_samples(self):
+        r"""Returns the samples of the template
+
+        Returns
+        -------
+        list of (str, BaseSample)
+            The sample ids and their Sample objects
+
+        Notes
+        -----
+        The values of all the samples are retrieved with a single query and
+        kept in the transaction cache, so reading the samples inside the same
+        transaction doesn't hit the DB
+        """
         with qdb.sql_connection.TRN:
-            return iter((sample_id, self._sample_cls(sample_id, self))
-                        for sample_id in self._get_sample_ids())
+            self._cache_sample_values()
+            return [(sample_id, self._sample_cls(sample_id, self))
+                    for sample_id in self._get_sample_ids()]
+
+    def _cache_sample_values(self):
+        r"""Retrieves the values of all the samples with a single query
+
+        Notes
+        -----
+        The values are kept in the transaction cache, so the Sample objects
+        of this template don't need to retrieve them one by one while the
+        transaction is ongoing
+        """
+        with qdb.sql_connection.TRN:
+            table_name = self._table_name(self._id)
+            sql = "SELECT sample_id, sample_values FROM qiita.{0}".format(
+                table_name)
+            qdb.sql_connection.TRN.add(sql)
+            _cached_info_file(table_name)['values'].update(
+                qdb.sql_connection.TRN.execute_fetchindex())
 
     def get(self, key):
         r"""Returns the metadata values for sample id `key`, or None if the
@@ -1357,6 +1550,7 @@ class MetadataTemplate(qdb.base.QiitaObject):
             to_update.reset_index(inplace=True)
             new_columns = []
             samples_updated = []
+            values_updated = []
             for sid, df in to_update.groupby('sample_name'):
                 samples_updated.append(sid)
                 # getting just columns: column and to, and then using column
@@ -1371,14 +1565,13 @@ class MetadataTemplate(qdb.base.QiitaObject):
                 #         'sample_type': '5'}}
                 values = df.to_dict()['to']
                 new_columns.extend(values.keys())
-                sql = """UPDATE qiita.{0}
-                         SET sample_values = sample_values || %s
-                         WHERE sample_id = %s""".format(
-                            self._table_name(self._id))
-                qdb.sql_connection.TRN.add(sql, [dumps(values), sid])
+                values_updated.append((sid, dumps(values)))
 
-            nc = list(set(new_columns).union(set(self.categories)))
             table_name = self._table_name(self.id)
+            _update_sample_values(table_name, values_updated)
+
+            nc = list(set(new_columns).union(set(self.categories)))
+            _forget_info_file(table_name)
             values = dumps({"columns": nc})
             sql = """UPDATE qiita.{0}
                      SET sample_values = %s
@@ -1473,7 +1666,7 @@ class MetadataTemplate(qdb.base.QiitaObject):
             for k, v in samples_and_values.items():
                 sample = self[k]
                 if isinstance(v, np.generic):
-                    v = np.asscalar(v)
+                    v = v.item()
                 sample.setitem(category, v)
 
             qdb.sql_connection.TRN.execute()
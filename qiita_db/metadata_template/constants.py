@@ -69,8 +69,9 @@ ALL_RESTRICTIONS = [SAMPLE_TEMPLATE_COLUMNS, PREP_TEMPLATE_COLUMNS,
 
 # This is what we consider as "NaN" cell values on metadata import
 # from http://www.ebi.ac.uk/ena/about/missing-values-reporting
-EBI_NULL_VALUES = ['Not applicable', 'Missing: Not collected',
-                   'Missing: Not provided', 'Missing: Restricted access']
+EBI_NULL_VALUES = frozenset({'Not applicable', 'Missing: Not collected',
+                             'Missing: Not provided',
+                             'Missing: Restricted access'})
 
 # These are what will be considered 'True' bool values on metadata import
 TRUE_VALUES = ['Yes', 'yes', 'YES', 'Y', 'y', 'True', 'true', 'TRUE', 't', 'T']
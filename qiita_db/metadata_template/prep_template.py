@@ -15,7 +15,7 @@ import qiita_db as qdb
 from .constants import (PREP_TEMPLATE_COLUMNS, TARGET_GENE_DATA_TYPES,
                         PREP_TEMPLATE_COLUMNS_TARGET_GENE)
 from .base_metadata_template import (
-    BaseSample, MetadataTemplate, QIITA_COLUMN_NAME)
+    BaseSample, MetadataTemplate, QIITA_COLUMN_NAME, _forget_info_file)
 
 
 def _check_duplicated_columns(prep_cols, sample_cols):
@@ -50,6 +50,8 @@ class PrepSample(BaseSample):
     BaseSample
     Sample
     """
+    __slots__ = ()
+
     _table = "prep_template_sample"
     _table_prefix = "prep_"
     _id_column = "prep_template_id"
@@ -80,6 +82,8 @@ class PrepTemplate(MetadataTemplate):
     MetadataTemplate
     SampleTemplate
     """
+    __slots__ = ()
+
     _table = "prep_template_sample"
     _table_prefix = "prep_"
     _id_column = "prep_template_id"
@@ -211,10 +215,18 @@ class PrepTemplate(MetadataTemplate):
             The investigation type is not in the ENA ontology
         """
         with qdb.sql_connection.TRN:
-            ontology = qdb.ontology.Ontology(
-                qdb.util.convert_to_id('ENA', 'ontology'))
-            terms = ontology.terms + ontology.user_defined_terms
-            if investigation_type not in terms:
+            # Check the term directly, the full list of terms is only needed
+            # to build the error message
+            sql = """SELECT EXISTS(
+                        SELECT *
+                        FROM qiita.term
+                            JOIN qiita.ontology USING (ontology_id)
+                        WHERE ontology = 'ENA' AND term = %s)"""
+            qdb.sql_connection.TRN.add(sql, [investigation_type])
+            if not qdb.sql_connection.TRN.execute_fetchlast():
+                ontology = qdb.ontology.Ontology(
+                    qdb.util.convert_to_id('ENA', 'ontology'))
+                terms = ontology.terms + ontology.user_defined_terms
                 raise qdb.exceptions.QiitaDBColumnError(
                     "'%s' is Not a valid investigation_type. Choose from: %s"
                     % (investigation_type, ', '.join(terms)))
@@ -262,6 +274,7 @@ class PrepTemplate(MetadataTemplate):
             # Drop the prep_X table
             sql = "DROP TABLE qiita.{0}".format(table_name)
             qdb.sql_connection.TRN.add(sql)
+            _forget_info_file(table_name)
 
             # Remove the rows from prep_template_samples
             sql = "DELETE FROM qiita.{0} WHERE {1} = %s".format(
@@ -279,6 +292,7 @@ class PrepTemplate(MetadataTemplate):
             qdb.sql_connection.TRN.add(sql, args)
 
             qdb.sql_connection.TRN.execute()
+            qdb.base._forget_objects(cls, [id_])
 
     def data_type(self, ret_id=False):
         """Returns the data_type or the data_type id
@@ -12,7 +12,7 @@ from qiita_core.exceptions import IncompetentQiitaDeveloperError
 
 import qiita_db as qdb
 from .base_metadata_template import (
-    BaseSample, MetadataTemplate, QIITA_COLUMN_NAME)
+    BaseSample, MetadataTemplate, QIITA_COLUMN_NAME, _forget_info_file)
 
 
 class Sample(BaseSample):
@@ -23,6 +23,8 @@ class Sample(BaseSample):
     BaseSample
     PrepSample
     """
+    __slots__ = ()
+
     _table = "study_sample"
     _table_prefix = "sample_"
     _id_column = "study_id"
@@ -53,6 +55,8 @@ class SampleTemplate(MetadataTemplate):
     MetadataTemplate
     PrepTemplate
     """
+    __slots__ = ()
+
     _table = "study_sample"
     _table_prefix = "sample_"
     _id_column = "study_id"
@@ -143,12 +147,14 @@ class SampleTemplate(MetadataTemplate):
 
             sql = "DROP TABLE qiita.{0}".format(table_name)
             qdb.sql_connection.TRN.add(sql)
+            _forget_info_file(table_name)
 
             sql = "DELETE FROM qiita.{0} WHERE {1} = %s".format(
                 cls._table, cls._id_column)
             qdb.sql_connection.TRN.add(sql, args)
 
             qdb.sql_connection.TRN.execute()
+            qdb.base._forget_objects(cls, [id_])
 
     @property
     def study_id(self):
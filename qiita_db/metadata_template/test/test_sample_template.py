@@ -229,6 +229,25 @@ class TestSample(TestCase):
         tester['tot_nitro'] = '1234.5'
         self.assertEqual(tester['tot_nitro'], '1234.5')
 
+    def test_setitem_same_transaction(self):
+        tester = qdb.metadata_template.sample_template.Sample(
+            '1.SKB1.640202', self.sample_template)
+        with qdb.sql_connection.TRN:
+            self.assertEqual(tester['tot_nitro'], '1.41')
+            # non text values are returned as text
+            tester['tot_nitro'] = 1234.5
+            self.assertEqual(tester['tot_nitro'], '1234.5')
+            self.assertEqual(tester._to_dict()['tot_nitro'], 1234.5)
+            qdb.sql_connection.TRN.rollback()
+
+    def test_setitem_items_same_transaction(self):
+        with qdb.sql_connection.TRN:
+            tester = dict(self.sample_template.items())['1.SKB1.640202']
+            self.assertEqual(tester['tot_nitro'], '1.41')
+            tester.setitem('tot_nitro', '2.5')
+            self.assertEqual(tester['tot_nitro'], '2.5')
+            qdb.sql_connection.TRN.rollback()
+
     def test_delitem(self):
         """delitem raises an error (currently not allowed)"""
         with self.assertRaises(qdb.exceptions.QiitaDBNotImplementedError):
@@ -693,6 +712,25 @@ class TestSampleTemplate(TestCase):
         for o, e in zip(sorted(list(obs)), sorted(exp)):
             self.assertEqual(o, e)
 
+    def test_items_same_transaction(self):
+        with qdb.sql_connection.TRN:
+            obs = {sid: s['season_environment']
+                   for sid, s in self.tester.items()}
+            self.assertEqual(len(obs), 27)
+            self.assertEqual(obs['1.SKB8.640193'], 'winter')
+
+    def test_items_queries(self):
+        with qdb.sql_connection.TRN:
+            samples = list(self.tester.items())
+            # The sample ids and all the sample values
+            self.assertEqual(qdb.sql_connection.TRN.index, 2)
+            obs = {sid: (s['season_environment'], len(s), s.get('not_a_col'))
+                   for sid, s in samples}
+            # Reading the samples in the same transaction doesn't hit the DB
+            self.assertEqual(qdb.sql_connection.TRN.index, 2)
+        self.assertEqual(len(obs), 27)
+        self.assertEqual(obs['1.SKB8.640193'], ('winter', 31, None))
+
     def test_get(self):
         """get returns the correct sample object"""
         obs = self.tester.get('1.SKM7.640188')
@@ -1413,6 +1451,33 @@ class TestSampleTemplate(TestCase):
             self.metadata, self.new_study)
         self.assertEqual(st.get_filepaths()[0][0], exp_id)
 
+    def test_extend_add_samples_same_transaction(self):
+        st = qdb.metadata_template.sample_template.SampleTemplate.create(
+            self.metadata, self.new_study)
+        md_dict = {
+            'Sample4': {'physical_specimen_location': 'location1',
+                        'physical_specimen_remaining': 'true',
+                        'dna_extracted': 'true',
+                        'sample_type': 'type1',
+                        'collection_timestamp': '2014-05-29 12:24:15',
+                        'host_subject_id': 'NotIdentified',
+                        'Description': 'Test Sample 4',
+                        'latitude': '42.42',
+                        'longitude': '41.41',
+                        'taxon_id': '9606',
+                        'scientific_name': 'homo sapiens'}}
+        md_ext = pd.DataFrame.from_dict(md_dict, orient='index', dtype=str)
+        sample_id = '%s.Sample4' % st.id
+        with qdb.sql_connection.TRN:
+            # the sample ids retrieved before extending are cached
+            self.assertEqual(len(st), 3)
+            self.assertNotIn(sample_id, st)
+            npt.assert_warns(qdb.exceptions.QiitaDBWarning, st.extend,
+                             md_ext)
+            self.assertEqual(len(st), 4)
+            self.assertIn(sample_id, st)
+            self.assertEqual(st[sample_id]['description'], 'Test Sample 4')
+
     def test_extend_add_samples(self):
         """extend correctly works adding new samples"""
         st = qdb.metadata_template.sample_template.SampleTemplate.create(
@@ -2256,6 +2321,30 @@ class TestSampleTemplate(TestCase):
         st.delete_column('dna_extracted')
         self.assertNotIn('dna_extracted', st.categories)
 
+    def test_delete_column_same_transaction(self):
+        st = qdb.metadata_template.sample_template.SampleTemplate.create(
+            self.metadata, self.new_study)
+        with qdb.sql_connection.TRN:
+            # the columns retrieved before the deletion are cached
+            self.assertIn('dna_extracted', st.categories)
+            st.delete_column('dna_extracted')
+            self.assertNotIn('dna_extracted', st.categories)
+            sample = st['%d.Sample1' % self.new_study.id]
+            self.assertNotIn('dna_extracted', sample)
+
+    def test_delete_samples_same_transaction(self):
+        st = qdb.metadata_template.sample_template.SampleTemplate.create(
+            self.metadata, self.new_study)
+        sample_id = '%d.Sample1' % self.new_study.id
+        with qdb.sql_connection.TRN:
+            sample = st[sample_id]
+            self.assertEqual(sample['dna_extracted'], 'true')
+            st.delete_samples([sample_id])
+            # the sample is gone, so it doesn't have values anymore
+            self.assertEqual(sample._to_dict(), {})
+            self.assertIsNone(sample['dna_extracted'])
+            self.assertIsNone(sample.get('dna_extracted'))
+
     def test_delete_column_specimen_id(self):
         st = qdb.metadata_template.sample_template.SampleTemplate.create(
             self.metadata, self.new_study)
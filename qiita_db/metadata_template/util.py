@@ -6,16 +6,14 @@
 # The full license is in the file LICENSE, distributed with this software.
 # -----------------------------------------------------------------------------
 from six import StringIO
+from sys import intern
 
 import pandas as pd
-import numpy as np
 import warnings
 from skbio.util import find_duplicates
 
 import qiita_db as qdb
 
-from string import ascii_letters, digits
-
 
 def prefix_sample_names_with_id(md_template, study_id):
     r"""prefix the sample_names in md_template with the study id
@@ -27,23 +25,19 @@ def prefix_sample_names_with_id(md_template, study_id):
     study_id : int
         The study to which the metadata belongs to
     """
-    # loop over the samples and prefix those that aren't prefixed
-    sid = str(study_id)
-    md_template['qiita_sample_name_with_id'] = pd.Series(
-        [idx if idx.split('.', 1)[0] == sid and idx != sid
-         else '%d.%s' % (study_id, idx)
-         for idx in md_template.index], index=md_template.index)
+    # prefix the samples that aren't prefixed, all of them at once
+    prefix = '%d.' % study_id
+    prefixed = md_template.index.str.startswith(prefix)
 
     # get the rows that are going to change
-    changes = len(md_template.index[
-        md_template['qiita_sample_name_with_id'] != md_template.index])
+    changes = len(prefixed) - prefixed.sum()
     if changes != 0 and changes != len(md_template.index):
         warnings.warn(
             "Some of the samples were already prefixed with the study id.",
             qdb.exceptions.QiitaDBWarning)
 
-    md_template.index = md_template.qiita_sample_name_with_id
-    del md_template['qiita_sample_name_with_id']
+    md_template.index = md_template.index.where(
+        prefixed, prefix + md_template.index)
     # The original metadata template had the index column unnamed -> remove
     # the name of the index for consistency
     md_template.index.name = None
@@ -191,9 +185,10 @@ def load_template_to_dataframe(fn, index='sample_name'):
     template.set_index(index, inplace=True)
 
     # it is not uncommon to find templates that have empty columns so let's
-    # find the columns that are all ''
-    columns = np.where(np.all(template.applymap(lambda x: x == ''), axis=0))
-    template.drop(template.columns[columns], axis=1, inplace=True)
+    # find the columns that are all ''. Note that the comparison is done for
+    # the whole frame at once, templates can have thousands of cells
+    empty = (template == '').all(axis=0)
+    template.drop(template.columns[empty.values], axis=1, inplace=True)
 
     initial_columns.remove(index)
     dropped_cols = initial_columns - set(template.columns)
@@ -216,6 +211,15 @@ def load_template_to_dataframe(fn, index='sample_name'):
             'they will cause conflicts with sample_name: %s'
             % ', '.join(sdrop), qdb.exceptions.QiitaDBWarning)
 
+    # Metadata columns usually have lots of repeated values (e.g. sample_type
+    # or env_material), but pandas creates a new string for every cell. Keep
+    # a single copy of the values of those columns to reduce memory usage
+    for column in template.columns:
+        values = template[column].dropna().unique()
+        if len(values) < len(template) // 2:
+            template[column] = template[column].map(
+                {v: intern(v) for v in values})
+
     # Pandas represents data with np.nan rather than Nones, change it to None
     # because psycopg2 knows that a None is a Null in SQL, while it doesn't
     # know what to do with NaN
@@ -243,15 +247,11 @@ def get_invalid_sample_names(sample_names):
     http://qiime.org/documentation/file_formats.html#mapping-file-overview.
     """
 
-    # from the QIIME mapping file documentation
-    valid = set(ascii_letters+digits+'.')
-    inv = []
-
-    for s in sample_names:
-        if set(s) - valid:
-            inv.append(s)
-
-    return inv
+    # from the QIIME mapping file documentation, only alphanumeric characters
+    # and periods are allowed. All the names are checked at once with pandas
+    sample_names = pd.Index(list(sample_names))
+    valid = sample_names.astype(str).str.match(r'[A-Za-z0-9.]*\Z')
+    return sample_names[~valid].tolist()
 
 
 def looks_like_qiime_mapping_file(fp):
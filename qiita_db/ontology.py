@@ -34,6 +34,8 @@ class Ontology(qdb.base.QiitaObject):
     terms
     shortname
     """
+    __slots__ = ()
+
     _table = 'ontology'
 
     def __contains__(self, value):
@@ -41,9 +43,10 @@ class Ontology(qdb.base.QiitaObject):
             sql = """SELECT EXISTS (
                         SELECT *
                         FROM qiita.term t
-                            JOIN qiita.{0} o ON t.ontology_id = o.ontology_id
+                            JOIN qiita.ontology o
+                                ON t.ontology_id = o.ontology_id
                         WHERE o.ontology_id = %s
-                            AND term = %s)""".format(self._table)
+                            AND term = %s)"""
             qdb.sql_connection.TRN.add(sql, [self._id, value])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -26,6 +26,8 @@ class Portal(qdb.base.QiitaObject):
     add_analyses
     remove_analyses
     """
+    __slots__ = ('portal',)
+
     _table = 'portal_type'
 
     def __init__(self, portal):
@@ -142,6 +144,13 @@ class Portal(qdb.base.QiitaObject):
                     " Cannot delete portal '%s', analyses still attached: %s" %
                     (portal, ', '.join(map(str, analyses))))
 
+            sql = """SELECT analysis_id
+                     FROM qiita.analysis_portal
+                        JOIN qiita.analysis USING (analysis_id)
+                     WHERE portal_type_id = %s AND dflt = TRUE"""
+            qdb.sql_connection.TRN.add(sql, [portal_id])
+            default_analyses = qdb.sql_connection.TRN.execute_fetchflatten()
+
             # Remove portal and default analyses for all users
             sql = """DO $do$
                 DECLARE
@@ -166,6 +175,8 @@ class Portal(qdb.base.QiitaObject):
                 END $do$;"""
             qdb.sql_connection.TRN.add(sql, [portal_id] * 2)
             qdb.sql_connection.TRN.execute()
+            qdb.base._forget_objects(Portal, [portal_id])
+            qdb.base._forget_objects(qdb.analysis.Analysis, default_analyses)
 
     @staticmethod
     def exists(portal):
@@ -254,7 +265,8 @@ class Portal(qdb.base.QiitaObject):
                      VALUES (%s, %s)"""
             if len(clean_studies) != 0:
                 qdb.sql_connection.TRN.add(
-                    sql, [[s, self._id] for s in clean_studies], many=True)
+                    sql, [[s, self._id] for s in clean_studies], many=True,
+                    batch=True)
             qdb.sql_connection.TRN.execute()
 
     def remove_studies(self, studies):
@@ -314,6 +326,8 @@ class Portal(qdb.base.QiitaObject):
             if len(clean_studies) != 0:
                 qdb.sql_connection.TRN.add(sql, [tuple(studies), self._id])
             qdb.sql_connection.TRN.execute()
+            qdb.base._forget_objects(
+                qdb.study.Study, clean_studies, self.portal)
 
     def get_analyses(self):
         """Returns all analyses belonging to a portal
@@ -418,7 +432,8 @@ class Portal(qdb.base.QiitaObject):
             clean_analyses = set(analyses).difference(duplicates)
             if len(clean_analyses) != 0:
                 qdb.sql_connection.TRN.add(
-                    sql, [[a, self._id] for a in clean_analyses], many=True)
+                    sql, [[a, self._id] for a in clean_analyses], many=True,
+                    batch=True)
             qdb.sql_connection.TRN.execute()
 
     def remove_analyses(self, analyses):
@@ -463,3 +478,5 @@ class Portal(qdb.base.QiitaObject):
                 qdb.sql_connection.TRN.add(
                     sql, [tuple(clean_analyses), self._id])
             qdb.sql_connection.TRN.execute()
+            qdb.base._forget_objects(
+                qdb.analysis.Analysis, clean_analyses, self.portal)
@@ -372,6 +372,7 @@ class ProcessingJob(qdb.base.QiitaObject):
     command
     parameters
     status
+    info
     log
     heartbeat
     step
@@ -381,6 +382,8 @@ class ProcessingJob(qdb.base.QiitaObject):
     exists
     create
     """
+    __slots__ = ()
+
     _table = 'processing_job'
     _launch_map = {'qiita-plugin-launcher':
                    {'function': launch_local,
@@ -743,6 +746,35 @@ class ProcessingJob(qdb.base.QiitaObject):
             qdb.sql_connection.TRN.add(sql, [self.id])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
+    @property
+    def info(self):
+        """Dict with the progress information of the job
+
+        Returns
+        -------
+        dict of {str: object}
+            The job status, step, heartbeat and error_msg. error_msg is the
+            message of the job log if the status of the job is 'error', None
+            otherwise
+
+        Notes
+        -----
+        The values are retrieved with a single query, so this should be used
+        instead of the properties with the same names when several of them
+        are needed
+        """
+        with qdb.sql_connection.TRN:
+            sql = """SELECT processing_job_status AS status, step, heartbeat,
+                            CASE WHEN processing_job_status = 'error'
+                                THEN msg END AS error_msg
+                     FROM qiita.processing_job
+                        JOIN qiita.processing_job_status
+                            USING (processing_job_status_id)
+                        LEFT JOIN qiita.logging USING (logging_id)
+                     WHERE processing_job_id = %s"""
+            qdb.sql_connection.TRN.add(sql, [self.id])
+            return dict(qdb.sql_connection.TRN.execute_fetchindex()[0])
+
     def _set_status(self, value):
         """Sets the status of the job
 
@@ -758,7 +790,13 @@ class ProcessingJob(qdb.base.QiitaObject):
             - If the current status of the job is 'success'
             - If the current status of the job is 'running' and `value` is
             'queued'
+        qiita_db.exceptions.QiitaDBLookupError
+            If `value` is not a valid job status
         """
+        # Validate the new status first: it doesn't need the DB, so an
+        # invalid value fails before retrieving the current status
+        new_status = qdb.util.convert_to_id(value, "processing_job_status")
+
         with qdb.sql_connection.TRN:
             current_status = self.status
             if current_status == 'success':
@@ -768,9 +806,6 @@ class ProcessingJob(qdb.base.QiitaObject):
                 raise qdb.exceptions.QiitaDBStatusError(
                     "Cannot revert the status of a 'running' job to 'queued'")
 
-            new_status = qdb.util.convert_to_id(
-                value, "processing_job_status")
-
             if (new_status in ('running', 'success', 'error') and
                     not self.command.analysis_only and
                     self.user.level == 'admin'):
@@ -1480,6 +1515,19 @@ class ProcessingJob(qdb.base.QiitaObject):
             If the job is already completed
         """
         with qdb.sql_connection.TRN:
+            # Running jobs send heartbeats all the time, so update those
+            # with a single query that also checks the status
+            sql = """UPDATE qiita.processing_job
+                     SET heartbeat = %s
+                     WHERE processing_job_id = %s
+                        AND processing_job_status_id = %s
+                     RETURNING processing_job_id"""
+            running = qdb.util.convert_to_id(
+                'running', 'processing_job_status')
+            qdb.sql_connection.TRN.add(sql, [datetime.now(), self.id, running])
+            if qdb.sql_connection.TRN.execute_fetchindex():
+                return
+
             status = self.status
             if status == 'queued':
                 self._set_status('running')
@@ -1842,6 +1890,8 @@ class ProcessingWorkflow(qdb.base.QiitaObject):
     root : list of qiita_db.processing_job.ProcessingJob
         The first job in the workflow
     """
+    __slots__ = ()
+
     _table = "processing_job_workflow"
 
     @classmethod
@@ -2240,6 +2290,7 @@ class ProcessingWorkflow(qdb.base.QiitaObject):
             qdb.sql_connection.TRN.add(sql, [job.id])
 
             qdb.sql_connection.TRN.execute()
+            qdb.base._forget_objects(ProcessingJob, [job.id])
 
     def submit(self):
         """Submits the workflow to execution
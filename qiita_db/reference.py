@@ -28,6 +28,8 @@ class Reference(qdb.base.QiitaObject):
     --------
     QiitaObject
     """
+    __slots__ = ()
+
     _table = "reference"
 
     @classmethod
@@ -87,11 +89,11 @@ class Reference(qdb.base.QiitaObject):
                     fps, "%s_%s" % (name, version), "reference")[0]
 
             # Insert the actual object to the db
-            sql = """INSERT INTO qiita.{0}
+            sql = """INSERT INTO qiita.reference
                         (reference_name, reference_version, sequence_filepath,
                          taxonomy_filepath, tree_filepath)
                      VALUES (%s, %s, %s, %s, %s)
-                     RETURNING reference_id""".format(cls._table)
+                     RETURNING reference_id"""
             qdb.sql_connection.TRN.add(
                 sql, [name, version, seq_id, tax_id, tree_id])
             id_ = qdb.sql_connection.TRN.execute_fetchlast()
@@ -116,25 +118,25 @@ class Reference(qdb.base.QiitaObject):
         """
         with qdb.sql_connection.TRN:
             sql = """SELECT EXISTS(
-                        SELECT * FROM qiita.{0}
+                        SELECT * FROM qiita.reference
                         WHERE reference_name=%s
-                            AND reference_version=%s)""".format(cls._table)
+                            AND reference_version=%s)"""
             qdb.sql_connection.TRN.add(sql, [name, version])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
     @property
     def name(self):
         with qdb.sql_connection.TRN:
-            sql = """SELECT reference_name FROM qiita.{0}
-                     WHERE reference_id = %s""".format(self._table)
+            sql = """SELECT reference_name FROM qiita.reference
+                     WHERE reference_id = %s"""
             qdb.sql_connection.TRN.add(sql, [self._id])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
     @property
     def version(self):
         with qdb.sql_connection.TRN:
-            sql = """SELECT reference_version FROM qiita.{0}
-                     WHERE reference_id = %s""".format(self._table)
+            sql = """SELECT reference_version FROM qiita.reference
+                     WHERE reference_id = %s"""
             qdb.sql_connection.TRN.add(sql, [self._id])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -59,6 +59,8 @@ class Command(qdb.base.QiitaObject):
     --------
     qiita_db.software.Software
     """
+    __slots__ = ()
+
     _table = "software_command"
 
     @classmethod
@@ -200,6 +202,36 @@ class Command(qdb.base.QiitaObject):
             qdb.sql_connection.TRN.add(sql, [id_])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
+    @classmethod
+    def _check_ids(cls, ids):
+        """Check which of the provided IDs actually exist in the database
+
+        Parameters
+        ----------
+        ids : iterable of int
+            The IDs to test
+
+        Returns
+        -------
+        set of int
+            The subset of `ids` that exist in the database
+
+        Notes
+        -----
+        This function overwrites the base function, as the sql layout doesn't
+        follow the same conventions done in the other classes.
+        """
+        ids = tuple(ids)
+        if not ids:
+            return set()
+
+        with qdb.sql_connection.TRN:
+            sql = """SELECT command_id
+                     FROM qiita.software_command
+                     WHERE command_id IN %s"""
+            qdb.sql_connection.TRN.add(sql, [ids])
+            return set(qdb.sql_connection.TRN.execute_fetchflatten())
+
     @classmethod
     def exists(cls, software, name):
         """Checks if the command already exists in the system
@@ -810,6 +842,8 @@ class Software(qdb.base.QiitaObject):
     --------
     qiita_db.software.Command
     """
+    __slots__ = ()
+
     _table = "software"
 
     @classmethod
@@ -1408,6 +1442,8 @@ class DefaultParameters(qdb.base.QiitaObject):
     --------
     qiita_db.software.Command
     """
+    __slots__ = ()
+
     _table = 'default_parameter_set'
 
     @classmethod
@@ -1776,6 +1812,8 @@ class DefaultWorkflowNode(qdb.base.QiitaObject):
     command
     parameters
     """
+    __slots__ = ()
+
     _table = "default_workflow_node"
 
     @property
@@ -1802,6 +1840,8 @@ class DefaultWorkflowEdge(qdb.base.QiitaObject):
     ----------
     connections
     """
+    __slots__ = ()
+
     _table = "default_workflow_edge"
 
     @property
@@ -1837,6 +1877,8 @@ class DefaultWorkflow(qdb.base.QiitaObject):
     which outputs of the source command are provided as input to the
     destination command.
     """
+    __slots__ = ()
+
     _table = "default_workflow"
 
     @classmethod
@@ -27,17 +27,27 @@ Classes
 # The full license is in the file LICENSE, distributed with this software.
 # -----------------------------------------------------------------------------
 from contextlib import contextmanager
-from itertools import chain
+from itertools import chain, groupby
 from functools import wraps
 
 from psycopg2 import (connect, ProgrammingError, Error as PostgresError,
                       OperationalError, errorcodes)
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, execute_batch
 from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 
 from qiita_core.qiita_settings import qiita_config
 
 
+# Number of queries sent to the server in a single round trip when a query is
+# added to the transaction with batch=True
+_BATCH_PAGE_SIZE = 100
+
+
+class _BatchedQuery(tuple):
+    """A (sql, sql_args) query of the transaction added with batch=True"""
+    __slots__ = ()
+
+
 def _checker(func):
     """Decorator to check that methods are executed inside the context"""
     @wraps(func)
@@ -202,7 +212,7 @@ class Transaction(object):
             raise ValueError("Error running SQL query: %s" % str(error))
 
     @_checker
-    def add(self, sql, sql_args=None, many=False):
+    def add(self, sql, sql_args=None, many=False, batch=False):
         """Add a sql query to the transaction
 
         Parameters
@@ -214,6 +224,12 @@ class Transaction(object):
         many : bool, optional
             Whether or not we should add the query multiple times to the
             transaction
+        batch : bool, optional
+            If `many` is true, whether to send the queries to the server in
+            pages instead of one round trip per query. Only for queries that
+            don't retrieve any value, as their results are None. If one of
+            them fails, the whole transaction is rolled back, but the error
+            doesn't tell which one failed
 
         Raises
         ------
@@ -232,13 +248,15 @@ class Transaction(object):
         """
         if not many:
             sql_args = [sql_args]
+            batch = False
 
         for args in sql_args:
             if args:
                 if not isinstance(args, (list, tuple, dict)):
                     raise TypeError("sql_args should be a list, tuple or dict."
                                     " Found %s" % type(args))
-            self._queries.append((sql, args))
+            query = (sql, args)
+            self._queries.append(_BatchedQuery(query) if batch else query)
 
     def _execute(self):
         """Internal function that actually executes the transaction
@@ -247,38 +265,69 @@ class Transaction(object):
         transaction
         """
         with self._get_cursor() as cur:
-            for sql, sql_args in self._queries:
-                # Execute the current SQL command
-                try:
-                    cur.execute(sql, sql_args)
-                except Exception as e:
-                    # We catch any exception as we want to make sure that we
-                    # rollback every time that something went wrong
-                    self._raise_execution_error(sql, sql_args, e)
-
-                try:
-                    res = cur.fetchall()
-                except ProgrammingError:
-                    # At this execution point, we don't know if the sql query
-                    # that we executed should retrieve values from the database
-                    # If the query was not supposed to retrieve any value
-                    # (e.g. an INSERT without a RETURNING clause), it will
-                    # raise a ProgrammingError. Otherwise it will just return
-                    # an empty list
-                    res = None
-                except PostgresError as e:
-                    # Some other error happened during the execution of the
-                    # query, so we need to rollback
-                    self._raise_execution_error(sql, sql_args, e)
-
-                # Store the results of the current query
-                self._results.append(res)
+            groups = groupby(self._queries, key=lambda q: (
+                q[0], isinstance(q, _BatchedQuery)))
+            for (sql, batched), queries in groups:
+                queries = list(queries)
+                if batched:
+                    # The queries were added with batch=True, so we send them
+                    # to the server in pages instead of one round trip per
+                    # query
+                    args = [sql_args for _, sql_args in queries]
+                    try:
+                        execute_batch(cur, sql, args,
+                                      page_size=_BATCH_PAGE_SIZE)
+                    except Exception as e:
+                        self._raise_execution_error(sql, args, e)
+                    self._results.extend([None] * len(queries))
+                    continue
+
+                for _, sql_args in queries:
+                    self._execute_query(cur, sql, sql_args)
 
         # wipe out the already executed queries
         self._queries = []
 
         return self._results
 
+    def _execute_query(self, cur, sql, sql_args):
+        """Executes a single query of the transaction and stores its result
+
+        Parameters
+        ----------
+        cur : psycopg2.cursor
+            The cursor used to execute the query
+        sql : str
+            The sql query
+        sql_args : list, tuple or dict of objects
+            The arguments to the sql query
+        """
+        # Execute the current SQL command
+        try:
+            cur.execute(sql, sql_args)
+        except Exception as e:
+            # We catch any exception as we want to make sure that we
+            # rollback every time that something went wrong
+            self._raise_execution_error(sql, sql_args, e)
+
+        try:
+            res = cur.fetchall()
+        except ProgrammingError:
+            # At this execution point, we don't know if the sql query
+            # that we executed should retrieve values from the database
+            # If the query was not supposed to retrieve any value
+            # (e.g. an INSERT without a RETURNING clause), it will
+            # raise a ProgrammingError. Otherwise it will just return
+            # an empty list
+            res = None
+        except PostgresError as e:
+            # Some other error happened during the execution of the
+            # query, so we need to rollback
+            self._raise_execution_error(sql, sql_args, e)
+
+        # Store the results of the current query
+        self._results.append(res)
+
     @_checker
     def execute(self):
         """Executes the transaction
@@ -385,6 +434,40 @@ class Transaction(object):
         """
         return list(chain.from_iterable(self.execute()[idx]))
 
+    @_checker
+    def copy_expert(self, sql, file):
+        """Executes a COPY ... FROM STDIN query reading the data from `file`
+
+        Parameters
+        ----------
+        sql : str
+            The COPY sql query
+        file : file-like object
+            The data to copy, in the format specified in `sql`
+
+        Raises
+        ------
+        RuntimeError
+            If invoked outside a context
+        ValueError
+            If the data can't be copied
+
+        Notes
+        -----
+        The queries already added to the transaction are executed first, so
+        the order of the queries is preserved. COPY sends all the rows to the
+        server in a single stream, so it should be used instead of adding
+        the same INSERT many times when inserting lots of rows.
+        """
+        self.execute()
+        with self._get_cursor() as cur:
+            try:
+                cur.copy_expert(sql, file)
+            except Exception as e:
+                self._raise_execution_error(sql, None, e)
+        # COPY doesn't retrieve any value from the database
+        self._results.append(None)
+
     def _funcs_executor(self, funcs, func_str):
         error_msg = []
         for f, args, kwargs in funcs:
@@ -75,6 +75,8 @@ class Study(qdb.base.QiitaObject):
     All setters raise QiitaDBStatusError if trying to change a public study.
     You should not be doing that.
     """
+    __slots__ = ()
+
     _table = "study"
     _portal_table = "study_portal"
     # The following columns are considered not part of the study info
@@ -98,8 +100,8 @@ class Study(qdb.base.QiitaObject):
             in order of ascending study_id
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT study_id FROM qiita.{}
-                     ORDER BY study_id""".format(cls._table)
+            sql = """SELECT study_id FROM qiita.study
+                     ORDER BY study_id"""
             qdb.sql_connection.TRN.add(sql)
 
             ids = qdb.sql_connection.TRN.execute_fetchflatten()
@@ -276,8 +278,8 @@ class Study(qdb.base.QiitaObject):
         with qdb.sql_connection.TRN:
             sql = """SELECT EXISTS(
                         SELECT study_id
-                        FROM qiita.{}
-                        WHERE study_title = %s)""".format(cls._table)
+                        FROM qiita.study
+                        WHERE study_title = %s)"""
             qdb.sql_connection.TRN.add(sql, [study_title])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -400,12 +402,12 @@ class Study(qdb.base.QiitaObject):
         """
         with qdb.sql_connection.TRN:
             # checking that the id_ exists
-            cls(id_)
+            study = cls(id_)
 
             if qdb.util.exists_table('sample_%d' % id_):
                 raise qdb.exceptions.QiitaDBError(
                     'Study "%s" cannot be erased because it has a '
-                    'sample template' % cls(id_).title)
+                    'sample template' % study.title)
 
             args = [id_]
 
@@ -432,6 +434,7 @@ class Study(qdb.base.QiitaObject):
             qdb.sql_connection.TRN.add(sql, args)
 
             qdb.sql_connection.TRN.execute()
+            qdb.base._forget_objects(cls, [id_])
 
     @classmethod
     def get_tags(cls):
@@ -493,8 +496,8 @@ class Study(qdb.base.QiitaObject):
             If the study was autoloaded or not
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT autoloaded FROM qiita.{0}
-                     WHERE study_id = %s""".format(self._table)
+            sql = """SELECT autoloaded FROM qiita.study
+                     WHERE study_id = %s"""
             qdb.sql_connection.TRN.add(sql, [self._id])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -507,8 +510,8 @@ class Study(qdb.base.QiitaObject):
         value : bool
             Whether the study was autoloaded
         """
-        sql = """UPDATE qiita.{0} SET autoloaded = %s
-                 WHERE study_id = %s""".format(self._table)
+        sql = """UPDATE qiita.study SET autoloaded = %s
+                 WHERE study_id = %s"""
         qdb.sql_connection.perform_as_transaction(sql, [value, self._id])
 
     @property
@@ -521,8 +524,8 @@ class Study(qdb.base.QiitaObject):
             Title of study
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT study_title FROM qiita.{0}
-                     WHERE study_id = %s""".format(self._table)
+            sql = """SELECT study_title FROM qiita.study
+                     WHERE study_id = %s"""
             qdb.sql_connection.TRN.add(sql, [self._id])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -535,8 +538,8 @@ class Study(qdb.base.QiitaObject):
         title : str
             The study title
         """
-        sql = """UPDATE qiita.{0} SET study_title = %s
-                 WHERE study_id = %s""".format(self._table)
+        sql = """UPDATE qiita.study SET study_title = %s
+                 WHERE study_id = %s"""
         qdb.sql_connection.perform_as_transaction(sql, [title, self._id])
 
     @property
@@ -549,8 +552,8 @@ class Study(qdb.base.QiitaObject):
             Study notes
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT notes FROM qiita.{0}
-                     WHERE study_id = %s""".format(self._table)
+            sql = """SELECT notes FROM qiita.study
+                     WHERE study_id = %s"""
             qdb.sql_connection.TRN.add(sql, [self._id])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -563,8 +566,8 @@ class Study(qdb.base.QiitaObject):
         notes : str
             The study notes
         """
-        sql = """UPDATE qiita.{0} SET notes = %s
-                 WHERE study_id = %s""".format(self._table)
+        sql = """UPDATE qiita.study SET notes = %s
+                 WHERE study_id = %s"""
         qdb.sql_connection.perform_as_transaction(sql, [notes, self._id])
 
     @property
@@ -577,8 +580,8 @@ class Study(qdb.base.QiitaObject):
             public_raw_download of study
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT public_raw_download FROM qiita.{0}
-                     WHERE study_id = %s""".format(self._table)
+            sql = """SELECT public_raw_download FROM qiita.study
+                     WHERE study_id = %s"""
             qdb.sql_connection.TRN.add(sql, [self._id])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -591,8 +594,8 @@ class Study(qdb.base.QiitaObject):
         public_raw_download : bool
             The study public_raw_download
         """
-        sql = """UPDATE qiita.{0} SET public_raw_download = %s
-                 WHERE study_id = %s""".format(self._table)
+        sql = """UPDATE qiita.study SET public_raw_download = %s
+                 WHERE study_id = %s"""
         qdb.sql_connection.perform_as_transaction(
             sql, [public_raw_download, self._id])
 
@@ -692,8 +695,8 @@ class Study(qdb.base.QiitaObject):
             Users the study is shared with
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT email FROM qiita.{0}_users
-                     WHERE study_id = %s""".format(self._table)
+            sql = """SELECT email FROM qiita.study_users
+                     WHERE study_id = %s"""
             qdb.sql_connection.TRN.add(sql, [self._id])
             return [qdb.user.User(uid)
                     for uid in qdb.sql_connection.TRN.execute_fetchflatten()]
@@ -915,11 +918,11 @@ class Study(qdb.base.QiitaObject):
                 raise TypeError('Environmental packages should be a list')
 
             # Get all the environmental packages
-            env_pkgs = [pkg[0]
-                        for pkg in qdb.util.get_environmental_packages()]
+            env_pkgs = {pkg[0]
+                        for pkg in qdb.util.get_environmental_packages()}
 
             # Check that all the passed values are valid environmental packages
-            missing = set(values).difference(env_pkgs)
+            missing = set(values) - env_pkgs
             if missing:
                 raise ValueError('Environmetal package(s) not recognized: %s'
                                  % ', '.join(missing))
@@ -967,8 +970,8 @@ class Study(qdb.base.QiitaObject):
         """
         with qdb.sql_connection.TRN:
             sql = """SELECT ebi_study_accession
-                     FROM qiita.{0}
-                     WHERE study_id = %s""".format(self._table)
+                     FROM qiita.study
+                     WHERE study_id = %s"""
             qdb.sql_connection.TRN.add(sql, [self._id])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -986,14 +989,18 @@ class Study(qdb.base.QiitaObject):
         QiitDBError
             If the study already has an EBI study accession
         """
-        if self.ebi_study_accession is not None:
-            raise qdb.exceptions.QiitaDBError(
-                "Study %s already has an EBI study accession"
-                % self.id)
-        sql = """UPDATE qiita.{}
-                 SET ebi_study_accession = %s
-                 WHERE study_id = %s""".format(self._table)
-        qdb.sql_connection.perform_as_transaction(sql, [value, self.id])
+        with qdb.sql_connection.TRN:
+            # Only set the accession if the study doesn't have one yet, so
+            # checking and setting it takes a single query
+            sql = """UPDATE qiita.study
+                     SET ebi_study_accession = %s
+                     WHERE study_id = %s AND ebi_study_accession IS NULL
+                     RETURNING study_id"""
+            qdb.sql_connection.TRN.add(sql, [value, self.id])
+            if not qdb.sql_connection.TRN.execute_fetchindex():
+                raise qdb.exceptions.QiitaDBError(
+                    "Study %s already has an EBI study accession"
+                    % self.id)
 
     def _ebi_submission_jobs(self):
         """Helper code to avoid duplication"""
@@ -1081,13 +1088,14 @@ class Study(qdb.base.QiitaObject):
             The study tags
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT study_tag
+            # Aggregate the tags on the server, so we get a single list back
+            # instead of one row per tag
+            sql = """SELECT array_agg(study_tag ORDER BY study_tag)
                         FROM qiita.study_tags
                         LEFT JOIN qiita.per_study_tags USING (study_tag)
-                        WHERE study_id = {0}
-                        ORDER BY study_tag""".format(self._id)
-            qdb.sql_connection.TRN.add(sql)
-            return [t[0] for t in qdb.sql_connection.TRN.execute_fetchindex()]
+                        WHERE study_id = %s"""
+            qdb.sql_connection.TRN.add(sql, [self._id])
+            return qdb.sql_connection.TRN.execute_fetchlast() or []
 
 # --- methods ---
     def artifacts(self, dtype=None, artifact_type=None):
@@ -1343,6 +1351,8 @@ class StudyPerson(qdb.base.QiitaObject):
     phone : str or None
         phone number of the person
     """
+    __slots__ = ()
+
     _table = "study_person"
 
     @classmethod
@@ -1356,8 +1366,8 @@ class StudyPerson(qdb.base.QiitaObject):
             in order of ascending study_person_id
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT study_person_id FROM qiita.{}
-                     ORDER BY study_person_id""".format(cls._table)
+            sql = """SELECT study_person_id FROM qiita.study_person
+                     ORDER BY study_person_id"""
             qdb.sql_connection.TRN.add(sql)
 
             for id_ in qdb.sql_connection.TRN.execute_fetchflatten():
@@ -1381,9 +1391,9 @@ class StudyPerson(qdb.base.QiitaObject):
         """
         with qdb.sql_connection.TRN:
             sql = """SELECT EXISTS(
-                        SELECT * FROM qiita.{0}
+                        SELECT * FROM qiita.study_person
                         WHERE name = %s
-                            AND affiliation = %s)""".format(cls._table)
+                            AND affiliation = %s)"""
             qdb.sql_connection.TRN.add(sql, [name, affiliation])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -1408,9 +1418,9 @@ class StudyPerson(qdb.base.QiitaObject):
                 raise qdb.exceptions.QiitaDBLookupError(
                         'Study person does not exist')
 
-            sql = """SELECT study_person_id FROM qiita.{0}
+            sql = """SELECT study_person_id FROM qiita.study_person
                         WHERE name = %s
-                     AND affiliation = %s""".format(cls._table)
+                     AND affiliation = %s"""
             qdb.sql_connection.TRN.add(sql, [name, affiliation])
             return cls(qdb.sql_connection.TRN.execute_fetchlast())
 
@@ -1437,19 +1447,22 @@ class StudyPerson(qdb.base.QiitaObject):
 
         """
         with qdb.sql_connection.TRN:
-            if cls.exists(name, affiliation):
-                sql = """SELECT study_person_id
-                         FROM qiita.{0}
-                         WHERE name = %s
-                            AND affiliation = %s""".format(cls._table)
-                args = [name, affiliation]
-            else:
-                sql = """INSERT INTO qiita.{0} (name, email, affiliation,
-                                                address, phone)
-                         VALUES (%s, %s, %s, %s, %s)
-                         RETURNING study_person_id""".format(cls._table)
-                args = [name, email, affiliation, address, phone]
-
+            # Insert the person if it doesn't exist and retrieve its id in a
+            # single query. Note that the SELECT doesn't see the row inserted
+            # by the same statement, so only one id is returned
+            sql = """WITH new_person AS (
+                        INSERT INTO qiita.study_person
+                            (name, email, affiliation, address, phone)
+                        VALUES (%s, %s, %s, %s, %s)
+                        ON CONFLICT (name, affiliation) DO NOTHING
+                        RETURNING study_person_id)
+                     SELECT study_person_id FROM new_person
+                     UNION ALL
+                     SELECT study_person_id
+                     FROM qiita.study_person
+                     WHERE name = %s AND affiliation = %s"""
+            args = [name, email, affiliation, address, phone, name,
+                    affiliation]
             qdb.sql_connection.TRN.add(sql, args)
             return cls(qdb.sql_connection.TRN.execute_fetchlast())
 
@@ -1494,6 +1507,7 @@ class StudyPerson(qdb.base.QiitaObject):
             sql = "DELETE FROM qiita.study_person WHERE study_person_id = %s"
             qdb.sql_connection.TRN.add(sql, [id_])
             qdb.sql_connection.TRN.execute()
+            qdb.base._forget_objects(cls, [id_])
 
     # Properties
     @property
@@ -1506,8 +1520,8 @@ class StudyPerson(qdb.base.QiitaObject):
             Name of person
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT name FROM qiita.{0}
-                     WHERE study_person_id = %s""".format(self._table)
+            sql = """SELECT name FROM qiita.study_person
+                     WHERE study_person_id = %s"""
             qdb.sql_connection.TRN.add(sql, [self._id])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -1521,8 +1535,8 @@ class StudyPerson(qdb.base.QiitaObject):
             Email of person
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT email FROM qiita.{0}
-                     WHERE study_person_id = %s""".format(self._table)
+            sql = """SELECT email FROM qiita.study_person
+                     WHERE study_person_id = %s"""
             qdb.sql_connection.TRN.add(sql, [self._id])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -1536,8 +1550,8 @@ class StudyPerson(qdb.base.QiitaObject):
             Affiliation of person
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT affiliation FROM qiita.{0}
-                     WHERE study_person_id = %s""".format(self._table)
+            sql = """SELECT affiliation FROM qiita.study_person
+                     WHERE study_person_id = %s"""
             qdb.sql_connection.TRN.add(sql, [self._id])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -1551,8 +1565,8 @@ class StudyPerson(qdb.base.QiitaObject):
             address or None if no address in database
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT address FROM qiita.{0}
-                     WHERE study_person_id = %s""".format(self._table)
+            sql = """SELECT address FROM qiita.study_person
+                     WHERE study_person_id = %s"""
             qdb.sql_connection.TRN.add(sql, [self._id])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -1565,8 +1579,8 @@ class StudyPerson(qdb.base.QiitaObject):
         value : str
             New address for person
         """
-        sql = """UPDATE qiita.{0} SET address = %s
-                 WHERE study_person_id = %s""".format(self._table)
+        sql = """UPDATE qiita.study_person SET address = %s
+                 WHERE study_person_id = %s"""
         qdb.sql_connection.perform_as_transaction(sql, [value, self._id])
 
     @property
@@ -1579,8 +1593,8 @@ class StudyPerson(qdb.base.QiitaObject):
             phone or None if no address in database
         """
         with qdb.sql_connection.TRN:
-            sql = """SELECT phone FROM qiita.{0}
-                     WHERE study_person_id = %s""".format(self._table)
+            sql = """SELECT phone FROM qiita.study_person
+                     WHERE study_person_id = %s"""
             qdb.sql_connection.TRN.add(sql, [self._id])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -1593,6 +1607,6 @@ class StudyPerson(qdb.base.QiitaObject):
         value : str
             New phone number for person
         """
-        sql = """UPDATE qiita.{0} SET phone = %s
-                 WHERE study_person_id = %s""".format(self._table)
+        sql = """UPDATE qiita.study_person SET phone = %s
+                 WHERE study_person_id = %s"""
         qdb.sql_connection.perform_as_transaction(sql, [value, self._id])
@@ -71,6 +71,14 @@ class ArchiveTest(TestCase):
         obs = qdb.archive.Archive.retrieve_feature_values('Nothing')
         self.assertEqual(obs, exp)
 
+        # filtering by features, repeated or as bytes
+        exp = {'featureA4': dumps({'valuesA': 'vA', 'int': 1})}
+        obs = qdb.archive.Archive.retrieve_feature_values(
+            features=['featureA4', b'featureA4', 'featureNothing'])
+        self.assertEqual(obs, exp)
+        obs = qdb.archive.Archive.retrieve_feature_values(features=[])
+        self.assertEqual(obs, {})
+
         # now merging_schemes should have 3 elements; note that 2 is empty
         # string because we are inserting an artifact [8] that was a direct
         # upload
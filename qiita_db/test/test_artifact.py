@@ -105,6 +105,33 @@ class ArtifactTestsReadOnly(TestCase):
         self.assertEqual(qdb.artifact.Artifact(4).timestamp,
                          datetime(2012, 10, 2, 17, 30, 00))
 
+    def test_info(self):
+        obs = qdb.artifact.Artifact(2).info
+        exp = {'name': 'Demultiplexed 1',
+               'timestamp': datetime(2012, 10, 1, 10, 30, 27),
+               'visibility': 'private',
+               'artifact_type': 'Demultiplexed',
+               'data_type': '18S',
+               'can_be_submitted_to_vamps': True,
+               'is_submitted_to_vamps': False}
+        self.assertEqual(obs, exp)
+
+    def test_infos(self):
+        obs = qdb.artifact.Artifact.infos([2, 1, 2])
+        exp = {1: {'name': 'Raw data 1',
+                   'timestamp': datetime(2012, 10, 1, 9, 30, 27),
+                   'visibility': 'private',
+                   'artifact_type': 'FASTQ',
+                   'data_type': '18S',
+                   'can_be_submitted_to_vamps': False,
+                   'is_submitted_to_vamps': False},
+               2: qdb.artifact.Artifact(2).info}
+        self.assertEqual(obs, exp)
+        self.assertEqual(qdb.artifact.Artifact.infos([]), {})
+
+        with self.assertRaises(qdb.exceptions.QiitaDBUnknownIDError):
+            qdb.artifact.Artifact.infos([1, 1000])
+
     def test_processing_parameters(self):
         self.assertIsNone(qdb.artifact.Artifact(1).processing_parameters)
         obs = qdb.artifact.Artifact(2).processing_parameters
@@ -36,6 +36,41 @@ class QiitaBaseTest(TestCase):
         with self.assertRaises(qdb.exceptions.QiitaDBUnknownIDError):
             qdb.artifact.Artifact(10)
 
+    def test_init_cached_in_transaction(self):
+        """The DB is not checked again for an object in the same transaction"""
+        with qdb.sql_connection.TRN:
+            qdb.artifact.Artifact(1)
+            idx = qdb.sql_connection.TRN.index
+            qdb.artifact.Artifact(1)
+            self.assertEqual(qdb.sql_connection.TRN.index, idx)
+
+            # A different portal requires checking again
+            qdb.analysis.Analysis(1)
+            qiita_config.portal = 'EMP'
+            with self.assertRaises(qdb.exceptions.QiitaDBError):
+                qdb.analysis.Analysis(1)
+
+    def test_init_deleted_in_transaction(self):
+        """Deleted objects are not considered existing in the transaction"""
+        with qdb.sql_connection.TRN:
+            person = qdb.study.StudyPerson.create(
+                'SomeDude', 'somedude@foo.bar', 'affil', '111 fake street',
+                '111-121-1313')
+            qdb.study.StudyPerson(person.id)
+            qdb.study.StudyPerson.delete(person.id)
+            with self.assertRaises(qdb.exceptions.QiitaDBUnknownIDError):
+                qdb.study.StudyPerson(person.id)
+            with self.assertRaises(qdb.exceptions.QiitaDBUnknownIDError):
+                qdb.study.StudyPerson.from_ids([person.id])
+
+    def test_slots(self):
+        """The attributes are stored in slots, ad-hoc attributes still work"""
+        tester = qdb.analysis.Analysis(1)
+        self.assertEqual(vars(tester), {})
+        tester.not_an_attribute = 1
+        self.assertEqual(tester.not_an_attribute, 1)
+        self.assertEqual(vars(tester), {'not_an_attribute': 1})
+
     def test_check_subclass(self):
         """Nothing happens if check_subclass called from a subclass"""
         self.tester._check_subclass()
@@ -51,6 +86,24 @@ class QiitaBaseTest(TestCase):
         self.assertTrue(self.tester._check_id(1))
         self.assertFalse(self.tester._check_id(100))
 
+    def test_check_ids(self):
+        """Correctly checks which ids exist on the database"""
+        self.assertEqual(qdb.artifact.Artifact._check_ids([1, 2, 100]),
+                         {1, 2})
+        self.assertEqual(qdb.artifact.Artifact._check_ids([]), set())
+        self.assertEqual(
+            qdb.user.User._check_ids(['test@foo.bar', 'nope@foo.bar']),
+            {'test@foo.bar'})
+        self.assertEqual(qdb.software.Command._check_ids([1, 1000]), {1})
+        self.assertEqual(
+            qdb.metadata_template.prep_template.PrepTemplate._check_ids(
+                [1, 1000]), {1})
+
+    def test_check_ids_error(self):
+        """Raises an error when called from the base class"""
+        with self.assertRaises(IncompetentQiitaDeveloperError):
+            qdb.base.QiitaObject._check_ids([1])
+
     def test_check_portal(self):
         """Correctly checks if object is accessable in portal given"""
         qiita_config.portal = 'QIITA'
@@ -61,6 +114,46 @@ class QiitaBaseTest(TestCase):
 
         self.assertTrue(self.tester._check_portal(1))
 
+    def test_check_id_and_portal(self):
+        """Correctly checks existence and portal access at the same time"""
+        qiita_config.portal = 'QIITA'
+        tester = qdb.analysis.Analysis(1)
+        self.assertEqual(tester._check_id_and_portal(1), (True, True))
+        self.assertEqual(tester._check_id_and_portal(1000), (False, False))
+        qiita_config.portal = 'EMP'
+        self.assertEqual(tester._check_id_and_portal(1), (True, False))
+
+        self.assertEqual(self.tester._check_id_and_portal(1), (True, True))
+        self.assertEqual(self.tester._check_id_and_portal(1000),
+                         (False, True))
+
+    def test_from_ids(self):
+        """Correctly instantiates multiple objects at once"""
+        obs = qdb.artifact.Artifact.from_ids([2, '1', 3])
+        exp = [qdb.artifact.Artifact(2), qdb.artifact.Artifact(1),
+               qdb.artifact.Artifact(3)]
+        self.assertEqual(obs, exp)
+        self.assertEqual([a.id for a in obs], [2, 1, 3])
+        self.assertEqual(qdb.artifact.Artifact.from_ids([]), [])
+
+        obs = qdb.user.User.from_ids(['test@foo.bar'])
+        self.assertEqual(obs, [qdb.user.User('test@foo.bar')])
+
+    def test_from_ids_error(self):
+        """Raises an error if any object can't be instantiated"""
+        with self.assertRaises(qdb.exceptions.QiitaDBUnknownIDError):
+            qdb.artifact.Artifact.from_ids([1, 1000])
+
+        with self.assertRaises(IncompetentQiitaDeveloperError):
+            qdb.base.QiitaObject.from_ids([1])
+
+        with self.assertRaises(IncompetentQiitaDeveloperError):
+            qdb.portal.Portal.from_ids(['QIITA'])
+
+        qiita_config.portal = 'EMP'
+        with self.assertRaises(qdb.exceptions.QiitaDBError):
+            qdb.analysis.Analysis.from_ids([1])
+
     def test_equal_self(self):
         """Equality works with the same object"""
         self.assertEqual(self.tester, self.tester)
@@ -7,9 +7,9 @@
 # -----------------------------------------------------------------------------
 
 from os import remove, close, mkdir
-from os.path import exists, join
+from os.path import exists, join, basename
 from tempfile import mkstemp, mkdtemp
-from shutil import rmtree
+from shutil import rmtree, copyfile
 from unittest import TestCase, main
 from six import StringIO
 from functools import partial
@@ -416,6 +416,21 @@ class TestUpdateArtifactFromCmd(TestCase):
                             self.checksums):
             self.assertEqual(qdb.util.compute_checksum(obs['fp']), exp)
 
+        # Updating with identical files doesn't replace them
+        exp_fps = artifact.filepaths
+        tmp_dir = mkdtemp()
+        fps = []
+        for x in sorted(exp_fps, key=lambda x: x['fp_type'], reverse=True):
+            fp = join(tmp_dir, basename(x['fp']))
+            copyfile(x['fp'], fp)
+            fps.append(fp)
+        new_artifact = qdb.commands.update_artifact_from_cmd(
+            fps, self.filepaths_types, artifact.id)
+        self.assertEqual(new_artifact.filepaths, exp_fps)
+        for fp in fps:
+            self.assertTrue(exists(fp))
+        rmtree(tmp_dir)
+
 
 CONFIG_1 = """[required]
 timeseries_type_id = 1
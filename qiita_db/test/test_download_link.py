@@ -0,0 +1,58 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2014--, The Qiita Development Team.
+#
+# Distributed under the terms of the BSD 3-clause License.
+#
+# The full license is in the file LICENSE, distributed with this software.
+# -----------------------------------------------------------------------------
+
+from unittest import TestCase, main
+from datetime import datetime, timedelta, timezone
+
+from jose import jwt as jose_jwt
+
+from qiita_core.util import qiita_test_checker
+from qiita_core.qiita_settings import qiita_config
+import qiita_db as qdb
+
+
+def _create_link(jti, exp):
+    jwt = jose_jwt.encode(
+        {"jti": jti, "exp": int(exp.timestamp() * 1000)},
+        qiita_config.jwt_secret, algorithm='HS256')
+    qdb.download_link.DownloadLink.create(jwt)
+
+
+@qiita_test_checker()
+class DownloadLinkTests(TestCase):
+    def _cache(self, jti):
+        # The download_link table is keyed by jti, so links are not
+        # instantiated by id; add them to the existing objects directly
+        key = (qdb.download_link.DownloadLink, jti, qiita_config.portal)
+        qdb.base._existing_objects().add(key)
+        return key
+
+    def test_delete_same_transaction(self):
+        exp = datetime.now(timezone.utc) + timedelta(days=7)
+        with qdb.sql_connection.TRN:
+            _create_link('test-jti', exp)
+            key = self._cache('test-jti')
+            qdb.download_link.DownloadLink.delete('test-jti')
+            self.assertFalse(
+                qdb.download_link.DownloadLink.exists('test-jti'))
+            self.assertNotIn(key, qdb.base._existing_objects())
+
+    def test_delete_expired_same_transaction(self):
+        now = datetime.now(timezone.utc)
+        with qdb.sql_connection.TRN:
+            _create_link('expired-jti', now - timedelta(days=1))
+            _create_link('valid-jti', now + timedelta(days=7))
+            expired = self._cache('expired-jti')
+            valid = self._cache('valid-jti')
+            qdb.download_link.DownloadLink.delete_expired()
+            self.assertNotIn(expired, qdb.base._existing_objects())
+            self.assertIn(valid, qdb.base._existing_objects())
+
+
+if __name__ == '__main__':
+    main()
@@ -106,6 +106,16 @@ class TestPortal(TestCase):
         with self.assertRaises(qdb.exceptions.QiitaDBError):
             qdb.portal.Portal.delete("NEWPORTAL3")
 
+    def test_remove_portal_same_transaction(self):
+        with qdb.sql_connection.TRN:
+            qdb.portal.Portal.create("NEWPORTAL", "SOMEDESC")
+            qiita_config.portal = "NEWPORTAL"
+            analysis = qdb.user.User("test@foo.bar").default_analysis
+            qdb.portal.Portal.delete("NEWPORTAL")
+            with self.assertRaises(qdb.exceptions.QiitaDBUnknownIDError):
+                qdb.analysis.Analysis(analysis.id)
+            qdb.sql_connection.TRN.rollback()
+
     def test_check_studies(self):
         with self.assertRaises(qdb.exceptions.QiitaDBError):
             self.qiita_portal._check_studies([2000000000000, 122222222222222])
@@ -161,6 +171,19 @@ class TestPortal(TestCase):
             qdb.exceptions.QiitaDBWarning, self.emp_portal.remove_studies,
             [self.study.id])
 
+    def test_remove_studies_same_transaction(self):
+        with qdb.sql_connection.TRN:
+            self.emp_portal.add_studies([self.study.id])
+            qiita_config.portal = 'EMP'
+            qdb.study.Study(self.study.id)
+            self.emp_portal.remove_studies([self.study.id])
+            with self.assertRaises(qdb.exceptions.QiitaDBError):
+                qdb.study.Study(self.study.id)
+            # it is still accessible on the other portals
+            qiita_config.portal = 'QIITA'
+            qdb.study.Study(self.study.id)
+            qdb.sql_connection.TRN.rollback()
+
     def test_get_analyses_by_portal(self):
         qiita_config.portal = 'EMP'
         exp = {qdb.analysis.Analysis(7), qdb.analysis.Analysis(8),
@@ -215,6 +238,17 @@ class TestPortal(TestCase):
 
         self.emp_portal.remove_studies([1])
 
+    def test_remove_analyses_same_transaction(self):
+        with qdb.sql_connection.TRN:
+            self.emp_portal.add_studies([1])
+            self.emp_portal.add_analyses([self.analysis.id])
+            qiita_config.portal = 'EMP'
+            qdb.analysis.Analysis(self.analysis.id)
+            self.emp_portal.remove_analyses([self.analysis.id])
+            with self.assertRaises(qdb.exceptions.QiitaDBError):
+                qdb.analysis.Analysis(self.analysis.id)
+            qdb.sql_connection.TRN.rollback()
+
 
 if __name__ == '__main__':
     main()
@@ -167,6 +167,19 @@ class ProcessingJobTest(TestCase):
         self.assertEqual(self.tester3.status, 'success')
         self.assertEqual(self.tester4.status, 'error')
 
+    def test_info(self):
+        self.assertEqual(self.tester1.info,
+                         {'status': 'queued', 'step': None, 'heartbeat': None,
+                          'error_msg': None})
+        self.assertEqual(self.tester2.info,
+                         {'status': 'running', 'step': 'demultiplexing',
+                          'heartbeat': datetime(2015, 11, 22, 21, 00, 00),
+                          'error_msg': None})
+        self.assertEqual(self.tester4.info,
+                         {'status': 'error', 'step': 'generating demux file',
+                          'heartbeat': datetime(2015, 11, 22, 21, 30, 00),
+                          'error_msg': self.tester4.log.msg})
+
     def test_submit(self):
         # In order to test a success, we need to actually run the job, which
         # will mean to run split libraries, for example.
@@ -243,6 +256,9 @@ class ProcessingJobTest(TestCase):
     def test_set_status(self):
         job = _create_job()
         self.assertEqual(job.status, 'in_construction')
+        with self.assertRaises(qdb.exceptions.QiitaDBLookupError):
+            job._set_status('not-a-status')
+        self.assertEqual(job.status, 'in_construction')
         job._set_status('queued')
         self.assertEqual(job.status, 'queued')
         job._set_status('running')
@@ -1096,6 +1112,34 @@ class ProcessingWorkflowTests(TestCase):
 
         self.assertEqual(list(tester.graph.nodes()), [])
 
+    def test_remove_same_transaction(self):
+        exp_command = qdb.software.Command(1)
+        json_str = (
+            '{"input_data": 1, "max_barcode_errors": 1.5, '
+            '"barcode_type": "golay_12", "max_bad_run_length": 3, '
+            '"rev_comp": false, "phred_quality_threshold": 3, '
+            '"rev_comp_barcode": false, "rev_comp_mapping_barcodes": false, '
+            '"min_per_read_length_fraction": 0.75, "sequence_max_n": 0,'
+            '"phred_offset": "auto"}')
+        exp_params = qdb.software.Parameters.load(exp_command,
+                                                  json_str=json_str)
+        exp_user = qdb.user.User('test@foo.bar')
+
+        with qdb.sql_connection.TRN:
+            tester = qdb.processing_job.ProcessingWorkflow.from_scratch(
+                exp_user, exp_params, name="Test processing workflow",
+                force=True)
+            parent = list(tester.graph.nodes())[0]
+            connections = {parent: {'demultiplexed': 'input_data'}}
+            tester.add(qdb.software.DefaultParameters(10),
+                       connections=connections)
+            job = list(tester.graph.edges())[0][1]
+            qdb.processing_job.ProcessingJob(job.id)
+            tester.remove(job)
+            with self.assertRaises(qdb.exceptions.QiitaDBUnknownIDError):
+                qdb.processing_job.ProcessingJob(job.id)
+            qdb.sql_connection.TRN.rollback()
+
     def test_remove_error(self):
         with self.assertRaises(
                 qdb.exceptions.QiitaDBOperationNotPermittedError):
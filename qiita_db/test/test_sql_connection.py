@@ -10,6 +10,7 @@ from unittest import TestCase, main
 from os import remove, close
 from os.path import exists
 from tempfile import mkstemp
+from io import StringIO
 
 from psycopg2._psycopg import connection
 from psycopg2 import connect
@@ -163,6 +164,86 @@ class TestTransaction(TestBase):
                                 ('insert3', True, 3),
                                 ('insert2', False, 20)])
 
+    def test_add_many_batch(self):
+        with qdb.sql_connection.TRN:
+            sql = "INSERT INTO qiita.test_table (int_column) VALUES (%s)"
+            qdb.sql_connection.TRN.add(sql, [[1], [2]], many=True, batch=True)
+            # batch only applies to queries added with many
+            qdb.sql_connection.TRN.add(sql, [3], batch=True)
+
+            exp = [(sql, [1]), (sql, [2]), (sql, [3])]
+            self.assertEqual(qdb.sql_connection.TRN._queries, exp)
+            self.assertEqual(
+                [isinstance(q, qdb.sql_connection._BatchedQuery)
+                 for q in qdb.sql_connection.TRN._queries],
+                [True, True, False])
+
+            # Remove queries so __exit__ doesn't try to execute it
+            qdb.sql_connection.TRN._queries = []
+
+    def test_execute_many_batch(self):
+        with qdb.sql_connection.TRN:
+            sql = """INSERT INTO qiita.test_table (str_column, int_column)
+                     VALUES (%s, %s)"""
+            args = [['insert1', 1], ['insert2', 2], ['insert3', 3]]
+            qdb.sql_connection.TRN.add(sql, args, many=True, batch=True)
+            qdb.sql_connection.TRN.add("SELECT 42")
+            obs = qdb.sql_connection.TRN.execute()
+            self.assertEqual(obs, [None, None, None, [[42]]])
+            self.assertEqual(qdb.sql_connection.TRN.index, 4)
+
+        self._assert_sql_equal([('insert1', True, 1),
+                                ('insert2', True, 2),
+                                ('insert3', True, 3)])
+
+    def test_execute_many_batch_error(self):
+        with qdb.sql_connection.TRN:
+            sql = "INSERT INTO qiita.test_table (int_column) VALUES (%s)"
+            qdb.sql_connection.TRN.add(sql, [2])
+            qdb.sql_connection.TRN.add(
+                sql, [[1], ['foo'], [3]], many=True, batch=True)
+            qdb.sql_connection.TRN.add(sql, [4])
+            with self.assertRaises(ValueError):
+                qdb.sql_connection.TRN.execute()
+            # The whole transaction is rolled back
+            self.assertEqual(qdb.sql_connection.TRN._queries, [])
+            self.assertEqual(qdb.sql_connection.TRN.index, 0)
+
+        self._assert_sql_equal([])
+
+    def test_execute_many_error(self):
+        with qdb.sql_connection.TRN:
+            sql = "INSERT INTO qiita.test_table (int_column) VALUES (%s)"
+            qdb.sql_connection.TRN.add(sql, [[1], ['foo']], many=True)
+            with self.assertRaises(ValueError):
+                qdb.sql_connection.TRN.execute()
+
+        self._assert_sql_equal([])
+
+    def test_copy_expert(self):
+        with qdb.sql_connection.TRN:
+            sql = "INSERT INTO qiita.test_table (int_column) VALUES (%s)"
+            qdb.sql_connection.TRN.add(sql, [1])
+            sql = """COPY qiita.test_table (str_column, int_column)
+                     FROM STDIN WITH (FORMAT CSV)"""
+            qdb.sql_connection.TRN.copy_expert(
+                sql, StringIO('copy1,2\n"copy,2",3\n'))
+            self.assertEqual(qdb.sql_connection.TRN.index, 2)
+
+            self._assert_sql_equal([])
+
+        self._assert_sql_equal([('foo', True, 1), ('copy1', True, 2),
+                                ('copy,2', True, 3)])
+
+    def test_copy_expert_error(self):
+        with qdb.sql_connection.TRN:
+            sql = """COPY qiita.test_table (str_column, int_column)
+                     FROM STDIN WITH (FORMAT CSV)"""
+            with self.assertRaises(ValueError):
+                qdb.sql_connection.TRN.copy_expert(sql, StringIO('copy1,a\n'))
+
+        self._assert_sql_equal([])
+
     def test_execute_return(self):
         with qdb.sql_connection.TRN:
             sql = """INSERT INTO qiita.test_table (str_column, int_column)
@@ -108,11 +108,14 @@ class DBUtilTests(DBUtilTestsBase):
             qdb.util.convert_to_id("private", "visibility", "visibility"), 3)
         self.assertEqual(
             qdb.util.convert_to_id("EMP", "portal_type", "portal"), 2)
+        self.assertEqual(qdb.util.convert_to_id("18S", "data_type"), 2)
 
     def test_convert_to_id_bad_value(self):
         """Tests that ids are returned correctly"""
         with self.assertRaises(qdb.exceptions.QiitaDBLookupError):
             qdb.util.convert_to_id("FAKE", "filepath_type")
+        with self.assertRaises(qdb.exceptions.QiitaDBLookupError):
+            qdb.util.convert_to_id("FAKE", "data_type")
 
     def test_get_artifact_types(self):
         obs = qdb.util.get_artifact_types()
@@ -183,6 +186,19 @@ class DBUtilTests(DBUtilTestsBase):
         self.assertTrue(qdb.util.check_count('qiita.study_person', 3))
         self.assertFalse(qdb.util.check_count('qiita.study_person', 2))
 
+    def test_get_stored_filepaths(self):
+        base_dir = qdb.util.get_db_files_base_dir()
+        obs = qdb.util.get_stored_filepaths(
+            ['/tmp/seqs.fastq', 'barcodes.fastq'], 2, "raw_data")
+        exp = [join(base_dir, 'raw_data', '2_seqs.fastq'),
+               join(base_dir, 'raw_data', '2_barcodes.fastq')]
+        self.assertEqual(obs, exp)
+
+        # the mountpoints of the artifact types have a subdirectory per
+        # artifact
+        obs = qdb.util.get_stored_filepaths(['/tmp/seqs.fastq'], 2, "FASTQ")
+        self.assertEqual(obs, [join(base_dir, 'FASTQ', '2', 'seqs.fastq')])
+
     def test_insert_filepaths(self):
         fd, fp = mkstemp()
         close(fd)
@@ -249,6 +265,39 @@ class DBUtilTests(DBUtilTestsBase):
 
         qdb.util.purge_filepaths()
 
+    def test_insert_filepaths_copy_many(self):
+        fps = []
+        for content in ("\n", "\n\n"):
+            fd, fp = mkstemp()
+            close(fd)
+            with open(fp, "w") as f:
+                f.write(content)
+            self.files_to_remove.append(fp)
+            fps.append(fp)
+
+        obs = qdb.util.insert_filepaths(
+            [(fp, 1) for fp in fps], 2, "raw_data", copy=True)
+        self.assertEqual(len(obs), 2)
+
+        # Check that the files have been copied correctly
+        for fp in fps:
+            exp_fp = join(qdb.util.get_db_files_base_dir(), "raw_data",
+                          "2_%s" % basename(fp))
+            self.assertTrue(exists(exp_fp))
+            self.assertTrue(exists(fp))
+            self.files_to_remove.append(exp_fp)
+
+        # Check that each filepath id corresponds to its file
+        with qdb.sql_connection.TRN:
+            qdb.sql_connection.TRN.add(
+                """SELECT filepath FROM qiita.filepath
+                   WHERE filepath_id IN %s ORDER BY filepath_id""",
+                [tuple(obs)])
+            obs = qdb.sql_connection.TRN.execute_fetchflatten()
+        self.assertEqual(obs, ["2_%s" % basename(fp) for fp in fps])
+
+        qdb.util.purge_filepaths()
+
     def test_insert_filepaths_string(self):
         fd, fp = mkstemp()
         close(fd)
@@ -60,6 +60,7 @@ class User(qdb.base.QiitaObject):
     mark_messages
     delete_messages
     """
+    __slots__ = ()
 
     _table = "qiita_user"
     # The following columns are considered not part of the user info
@@ -84,6 +85,35 @@ class User(qdb.base.QiitaObject):
             qdb.sql_connection.TRN.add(sql, [id_])
             return qdb.sql_connection.TRN.execute_fetchlast()
 
+    @classmethod
+    def _check_ids(cls, ids):
+        r"""Check which of the provided IDs actually exist in the database
+
+        Parameters
+        ----------
+        ids : iterable of object
+            The IDs to test
+
+        Returns
+        -------
+        set of object
+            The subset of `ids` that exist in the database
+
+        Notes
+        -----
+        This function overwrites the base function, as sql layout doesn't
+        follow the same conventions done in the other classes.
+        """
+        ids = tuple(ids)
+        if not ids:
+            return set()
+
+        with qdb.sql_connection.TRN:
+            sql = """SELECT email FROM qiita.qiita_user
+                     WHERE email IN %s"""
+            qdb.sql_connection.TRN.add(sql, [ids])
+            return set(qdb.sql_connection.TRN.execute_fetchflatten())
+
     @classmethod
     def iter(cls):
         """Iterates over all users, sorted by their email addresses
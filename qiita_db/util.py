@@ -47,17 +47,16 @@ from random import SystemRandom
 from string import ascii_letters, digits, punctuation
 from binascii import crc32
 from bcrypt import hashpw, gensalt
-from functools import partial
+from functools import partial, lru_cache
 from os.path import join, basename, isdir, exists, getsize
-from os import walk, remove, listdir, rename
+from os import walk, remove, listdir, rename, scandir
 from glob import glob
 from shutil import move, rmtree, copy as shutil_copy
-from openpyxl import load_workbook
 from tempfile import mkstemp
 from csv import writer as csv_writer
 from datetime import datetime
-from itertools import chain
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import h5py
 from humanize import naturalsize
 import hashlib
@@ -158,6 +157,39 @@ def get_artifact_types(key_by_id=False):
         return dict(qdb.sql_connection.TRN.execute_fetchindex())
 
 
+# Vocabulary tables that convert_to_id resolves through _get_vocabulary
+_CACHED_VOCABULARIES = frozenset(
+    {'data_type', 'filepath_type', 'processing_job_status', 'severity'})
+
+
+@lru_cache(maxsize=None)
+def _get_vocabulary(table, cols):
+    """Gets the contents of a vocabulary table as a dict
+
+    Parameters
+    ----------
+    table : str
+        The vocabulary table, e.g. "filepath_type"
+    cols : str
+        The key and value columns, comma separated
+
+    Returns
+    -------
+    dict
+        The table contents, of the form {key: value}
+
+    Notes
+    -----
+    These tables are only modified by the DB patches, so they are retrieved
+    only once per process. `qiita_db.environment_manager.patch` clears the
+    cache after applying each patch.
+    """
+    with qdb.sql_connection.TRN:
+        sql = 'SELECT {} FROM qiita.{}'.format(cols, table)
+        qdb.sql_connection.TRN.add(sql)
+        return dict(qdb.sql_connection.TRN.execute_fetchindex())
+
+
 def get_filepath_types(key='filepath_type'):
     """Gets the list of possible filepath types from the filetype table
 
@@ -175,18 +207,16 @@ def get_filepath_types(key='filepath_type'):
         - If `key` is "filepath_type_id", dict is of the form
           {filepath_type_id: filepath_type}
     """
-    with qdb.sql_connection.TRN:
-        if key == 'filepath_type':
-            cols = 'filepath_type, filepath_type_id'
-        elif key == 'filepath_type_id':
-            cols = 'filepath_type_id, filepath_type'
-        else:
-            raise qdb.exceptions.QiitaDBColumnError(
-                "Unknown key. Pass either 'filepath_type' or "
-                "'filepath_type_id'.")
-        sql = 'SELECT {} FROM qiita.filepath_type'.format(cols)
-        qdb.sql_connection.TRN.add(sql)
-        return dict(qdb.sql_connection.TRN.execute_fetchindex())
+    if key == 'filepath_type':
+        cols = 'filepath_type, filepath_type_id'
+    elif key == 'filepath_type_id':
+        cols = 'filepath_type_id, filepath_type'
+    else:
+        raise qdb.exceptions.QiitaDBColumnError(
+            "Unknown key. Pass either 'filepath_type' or "
+            "'filepath_type_id'.")
+    # Copy, so callers can't modify the cached values
+    return dict(_get_vocabulary('filepath_type', cols))
 
 
 def get_data_types(key='data_type'):
@@ -205,17 +235,15 @@ def get_data_types(key='data_type'):
         - If `key` is "data_type_id", dict is of the form
           {data_type_id: data_type}
     """
-    with qdb.sql_connection.TRN:
-        if key == 'data_type':
-            cols = 'data_type, data_type_id'
-        elif key == 'data_type_id':
-            cols = 'data_type_id, data_type'
-        else:
-            raise qdb.exceptions.QiitaDBColumnError(
-                "Unknown key. Pass either 'data_type_id' or 'data_type'.")
-        sql = 'SELECT {} FROM qiita.data_type'.format(cols)
-        qdb.sql_connection.TRN.add(sql)
-        return dict(qdb.sql_connection.TRN.execute_fetchindex())
+    if key == 'data_type':
+        cols = 'data_type, data_type_id'
+    elif key == 'data_type_id':
+        cols = 'data_type_id, data_type'
+    else:
+        raise qdb.exceptions.QiitaDBColumnError(
+            "Unknown key. Pass either 'data_type_id' or 'data_type'.")
+    # Copy, so callers can't modify the cached values
+    return dict(_get_vocabulary('data_type', cols))
 
 
 def create_rand_string(length, punct=True):
@@ -368,9 +396,12 @@ def exists_table(table):
         Whether `table` exists on the database or not
     """
     with qdb.sql_connection.TRN:
+        # Look the table up directly in the catalog: information_schema.tables
+        # is a view that builds the privileges of every relation of the
+        # database before filtering them
         sql = """SELECT exists(
-                    SELECT * FROM information_schema.tables
-                    WHERE table_name=%s)"""
+                    SELECT * FROM pg_catalog.pg_class
+                    WHERE relname=%s AND relkind IN ('r', 'v', 'f', 'p'))"""
         qdb.sql_connection.TRN.add(sql, [table])
         return qdb.sql_connection.TRN.execute_fetchlast()
 
@@ -415,6 +446,11 @@ def max_preparation_samples():
         return qdb.sql_connection.TRN.execute_fetchlast()
 
 
+# Maximum number of files read at the same time when copying files or
+# computing their checksums
+_IO_WORKERS = 4
+
+
 def compute_checksum(path):
     r"""Returns the checksum of the file pointed by path
 
@@ -436,14 +472,17 @@ def compute_checksum(path):
     else:
         filepaths.append(path)
 
-    buffersize = 65536
+    # Read the files in chunks into the same buffer, so we don't load whole
+    # files (which can be several GB) nor allocate a new object per chunk
+    buffr = bytearray(1 << 20)
+    view = memoryview(buffr)
     crcvalue = 0
     for fp in filepaths:
         with open(fp, 'rb') as f:
-            buffr = f.read(buffersize)
-            while len(buffr) > 0:
-                crcvalue = crc32(buffr, crcvalue)
-                buffr = f.read(buffersize)
+            read = f.readinto(buffr)
+            while read:
+                crcvalue = crc32(view[:read], crcvalue)
+                read = f.readinto(buffr)
     # We need the & 0xFFFFFFFF in order to get the same numeric value across
     # all python versions and platforms
     return crcvalue & 0xFFFFFFFF
@@ -467,10 +506,13 @@ def get_files_from_uploads_folders(study_id):
     for pid, p in get_mountpoint("uploads", retrieve_all=True):
         t = join(p, study_id)
         if exists(t):
-            for f in listdir(t):
-                d = join(t, f)
-                if not f.startswith('.') and not isdir(d):
-                    fp.append((pid, f, naturalsize(getsize(d), gnu=True)))
+            # scandir gives us the file type and size without an extra stat
+            # call per file, which matters for large upload folders
+            with scandir(t) as entries:
+                for e in entries:
+                    if not e.name.startswith('.') and not e.is_dir():
+                        fp.append((pid, e.name,
+                                   naturalsize(e.stat().st_size, gnu=True)))
 
     return fp
 
@@ -494,6 +536,9 @@ def move_upload_files_to_trash(study_id, files_to_move):
     trash_folder = 'trash'
     folders = {k: v for k, v in get_mountpoint("uploads", retrieve_all=True)}
 
+    # The folders are checked (and their trash folder created) only once,
+    # instead of once per file, as usually all the files live in the same one
+    checked_folders = set()
     for fid, filename in files_to_move:
         if filename == trash_folder:
             raise qdb.exceptions.QiitaDBError(
@@ -504,18 +549,22 @@ def move_upload_files_to_trash(study_id, files_to_move):
                 "The filepath id: %d doesn't exist in the database" % fid)
 
         foldername = join(folders[fid], str(study_id))
-        if not exists(foldername):
-            raise qdb.exceptions.QiitaDBError(
-                "The upload folder for study id: %d doesn't exist" % study_id)
-
-        trashpath = join(foldername, trash_folder)
-        create_nested_path(trashpath)
+        if foldername not in checked_folders:
+            if not exists(foldername):
+                raise qdb.exceptions.QiitaDBError(
+                    "The upload folder for study id: %d doesn't exist"
+                    % study_id)
+            create_nested_path(join(foldername, trash_folder))
+            checked_folders.add(foldername)
 
         fullpath = join(foldername, filename)
         new_fullpath = join(foldername, trash_folder, filename)
 
-        if exists(fullpath):
+        try:
             rename(fullpath, new_fullpath)
+        except FileNotFoundError:
+            # The file is already gone, nothing to move
+            pass
 
 
 def get_mountpoint(mount_type, retrieve_all=False, retrieve_subdir=False):
@@ -576,6 +625,53 @@ def get_mountpoint_path_by_id(mount_id):
         return join(get_db_files_base_dir(), mountpoint)
 
 
+def _stored_filepath(filepath, obj_id, mountpoint, subdir):
+    r"""Returns the path in which `filepath` is stored for object `obj_id`
+
+    Parameters
+    ----------
+    filepath : str
+        The original path of the file
+    obj_id : int
+        Id of the object the file belongs to
+    mountpoint : str
+        The path to the mountpoint in which the file is stored
+    subdir : bool
+        Whether the mountpoint stores the files in a subdirectory per object
+
+    Returns
+    -------
+    str
+        The path to the file in the controlled DB directory
+    """
+    if subdir:
+        # format: mountpoint/obj_id/original_name
+        return join(mountpoint, str(obj_id), basename(filepath))
+    # format: mountpoint/DataId_OriginalName
+    return join(mountpoint, "%s_%s" % (obj_id, basename(filepath)))
+
+
+def get_stored_filepaths(filepaths, obj_id, table):
+    r"""Returns the paths in which insert_filepaths stores `filepaths`
+
+    Parameters
+    ----------
+    filepaths : iterable of str
+        The original paths of the files
+    obj_id : int
+        Id of the object the files belong to
+    table : str
+        Table that holds the file data
+
+    Returns
+    -------
+    list of str
+        The paths to the files in the controlled DB directory
+    """
+    _, mp, subdir = get_mountpoint(table, retrieve_subdir=True)[0]
+    return [_stored_filepath(fp, obj_id, mp, subdir) for fp in filepaths]
+
+
 def insert_filepaths(filepaths, obj_id, table, move_files=True, copy=False):
     r"""Inserts `filepaths` in the database.
 
@@ -611,48 +707,89 @@ def insert_filepaths(filepaths, obj_id, table, move_files=True, copy=False):
         base_fp = join(get_db_files_base_dir(), mp)
 
         if move_files:
-            db_path = partial(join, base_fp)
             if subdir:
-                # Generate the new filepaths, format:
-                # mountpoint/obj_id/original_name
-                dirname = db_path(str(obj_id))
-                create_nested_path(dirname)
-                new_filepaths = [
-                    (join(dirname, basename(path)), id_)
-                    for path, id_ in filepaths]
-            else:
-                # Generate the new fileapths. format:
-                # mountpoint/DataId_OriginalName
-                new_filepaths = [
-                    (db_path("%s_%s" % (obj_id, basename(path))), id_)
-                    for path, id_ in filepaths]
+                create_nested_path(join(base_fp, str(obj_id)))
+            # Generate the new filepaths
+            new_filepaths = [
+                (_stored_filepath(path, obj_id, base_fp, subdir), id_)
+                for path, id_ in filepaths]
             # Move the original files to the controlled DB directory
-            transfer_function = shutil_copy if copy else move
-            for old_fp, new_fp in zip(filepaths, new_filepaths):
-                transfer_function(old_fp[0], new_fp[0])
+            pairs = list(zip(filepaths, new_filepaths))
+            if copy and len(pairs) > 1:
+                # Copying is I/O bound (and shutil releases the GIL while
+                # doing it), so copy the files concurrently
+                with ThreadPoolExecutor(
+                        max_workers=min(_IO_WORKERS, len(pairs))) as pool:
+                    copies = [pool.submit(shutil_copy, old_fp[0], new_fp[0])
+                              for old_fp, new_fp in pairs]
                 # In case the transaction executes a rollback, we need to
                 # make sure the files have not been moved
-                qdb.sql_connection.TRN.add_post_rollback_func(
-                    move, new_fp[0], old_fp[0])
+                for (old_fp, new_fp), f in zip(pairs, copies):
+                    if f.exception() is None:
+                        qdb.sql_connection.TRN.add_post_rollback_func(
+                            move, new_fp[0], old_fp[0])
+                for f in copies:
+                    f.result()
+            else:
+                transfer_function = shutil_copy if copy else move
+                for old_fp, new_fp in pairs:
+                    transfer_function(old_fp[0], new_fp[0])
+                    # In case the transaction executes a rollback, we need to
+                    # make sure the files have not been moved
+                    qdb.sql_connection.TRN.add_post_rollback_func(
+                        move, new_fp[0], old_fp[0])
+
+        # Resolve the filepath types with the cached vocabulary, instead of
+        # one query per file
+        fp_types = None
 
         def str_to_id(x):
-            return (x if isinstance(x, int)
-                    else convert_to_id(x, "filepath_type"))
+            nonlocal fp_types
+            if isinstance(x, int):
+                return x
+            if fp_types is None:
+                fp_types = get_filepath_types()
+            try:
+                return fp_types[x]
+            except KeyError:
+                raise qdb.exceptions.QiitaDBLookupError(
+                    "%s not valid for table filepath_type" % x)
+        # Computing the checksums is I/O bound (and crc32 releases the GIL),
+        # so read the files concurrently
+        paths = [path for path, _ in new_filepaths]
+        if len(paths) > 1:
+            with ThreadPoolExecutor(
+                    max_workers=min(_IO_WORKERS, len(paths))) as pool:
+                checksums = list(pool.map(compute_checksum, paths))
+        else:
+            checksums = [compute_checksum(path) for path in paths]
         # 1 is the checksum algorithm, which we only have one implemented
-        values = [[basename(path), str_to_id(id_), compute_checksum(path),
-                   getsize(path), 1, dd_id] for path, id_ in new_filepaths]
-        # Insert all the filepaths at once and get the filepath_id back
+        values = [[basename(path), str_to_id(id_), checksum,
+                   getsize(path), 1, dd_id]
+                  for (path, id_), checksum in zip(new_filepaths, checksums)]
+        if not values:
+            return []
+
+        # Insert all the filepaths with a single statement, instead of one
+        # per file. The ids are reserved beforehand, so we know which one
+        # belongs to each file
+        sql = """SELECT nextval(
+                    pg_get_serial_sequence('qiita.filepath', 'filepath_id'))
+                 FROM generate_series(1, %s)"""
+        qdb.sql_connection.TRN.add(sql, [len(values)])
+        fp_ids = qdb.sql_connection.TRN.execute_fetchflatten()
         sql = """INSERT INTO qiita.filepath
-                    (filepath, filepath_type_id, checksum, fp_size,
-                     checksum_algorithm_id, data_directory_id)
-                 VALUES (%s, %s, %s, %s, %s, %s)
-                 RETURNING filepath_id"""
-        idx = qdb.sql_connection.TRN.index
-        qdb.sql_connection.TRN.add(sql, values, many=True)
-        # Since we added the query with many=True, we've added len(values)
-        # queries to the transaction, so the ids are in the last idx queries
-        return list(chain.from_iterable(
-            chain.from_iterable(qdb.sql_connection.TRN.execute()[idx:])))
+                    (filepath_id, filepath, filepath_type_id, checksum,
+                     fp_size, checksum_algorithm_id, data_directory_id)
+                 SELECT * FROM unnest(%s::bigint[], %s::varchar[],
+                                      %s::bigint[], %s::varchar[],
+                                      %s::bigint[], %s::bigint[],
+                                      %s::bigint[])"""
+        columns = [list(col) for col in zip(*values)]
+        columns[2] = [str(checksum) for checksum in columns[2]]
+        qdb.sql_connection.TRN.add(sql, [fp_ids] + columns)
+        qdb.sql_connection.TRN.execute()
+        return fp_ids
 
 
 def _path_builder(db_dir, filepath, mountpoint, subdirectory, obj_id):
@@ -1116,6 +1253,15 @@ def convert_to_id(value, table, text_col=None):
         The passed string has no associated id
     """
     text_col = table if text_col is None else text_col
+    if table in _CACHED_VOCABULARIES and text_col == table:
+        # Same cache used by get_data_types/get_filepath_types, so these
+        # lookups don't need to hit the DB
+        _id = _get_vocabulary(table, '%s, %s_id' % (table, table)).get(value)
+        if _id is None:
+            raise qdb.exceptions.QiitaDBLookupError(
+                "%s not valid for table %s" % (value, table))
+        return _id
+
     with qdb.sql_connection.TRN:
         sql = "SELECT {0}_id FROM qiita.{0} WHERE {1} = %s".format(
             table, text_col)
@@ -1317,7 +1463,7 @@ def add_message(message, users):
         sql = """INSERT INTO qiita.message_user (email, message_id)
                  VALUES (%s, %s)"""
         sql_args = [[user.id, msg_id] for user in users]
-        qdb.sql_connection.TRN.add(sql, sql_args, many=True)
+        qdb.sql_connection.TRN.add(sql, sql_args, many=True, batch=True)
         qdb.sql_connection.TRN.execute()
 
 
@@ -1856,7 +2002,9 @@ def _get_filehandle(filepath_or, *args, **kwargs):
         if h5py.is_hdf5(filepath_or):
             fh, own_fh = h5py.File(filepath_or, *args, **kwargs), True
         elif filepath_or.endswith('.xlsx'):
-            # due to extension, let's assume Excel file
+            # due to extension, let's assume Excel file. openpyxl is only
+            # needed here and it is slow to import, so only load it when used
+            from openpyxl import load_workbook
             wb = load_workbook(filename=filepath_or, data_only=True)
             sheetnames = wb.sheetnames
             # let's check if Qiimp, they must be in same order
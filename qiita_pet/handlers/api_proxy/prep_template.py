@@ -697,7 +697,8 @@ def prep_template_jobs_get_req(prep_id, user_id):
         job_info = defaultdict(lambda: '', loads(job_info))
         job_id = job_info['job_id']
         job = ProcessingJob(job_id)
-        result[job.id] = {'status': job.status, 'step': job.step,
+        info = job.info
+        result[job.id] = {'status': info['status'], 'step': info['step'],
                           'error': job.log.msg if job.log else ""}
 
     return result
@@ -358,7 +358,10 @@ def submit_VAMPS(artifact_id):
     targz_fp = join(targz_folder, '%d_%d_%d.tgz' % (study.id,
                                                     prep_template.id,
                                                     artifact_id))
-    targz = taropen(targz_fp, mode='w:gz')
+    # tarfile compresses with gzip's slowest level (9) by default; the
+    # default level of the gzip tool (6) is much faster on large fasta files
+    # for a negligibly bigger file
+    targz = taropen(targz_fp, mode='w:gz', compresslevel=6)
 
     # adding sample/prep
     samp_fp = join(targz_folder, 'sample_metadata.txt')
@@ -8,7 +8,7 @@
 
 from os.path import basename, join, isdir, isfile, exists
 from shutil import copyfile, rmtree
-from os import remove, listdir, makedirs
+from os import remove, listdir, makedirs, link
 from datetime import date, timedelta
 from urllib.parse import quote
 from itertools import zip_longest
@@ -31,6 +31,7 @@ from qiita_db.artifact import Artifact
 from qiita_db.metadata_template.constants import (
     TARGET_GENE_DATA_TYPES, PREP_TEMPLATE_COLUMNS_TARGET_GENE)
 from qiita_db.processing_job import _system_call as system_call
+from qiita_db.sql_connection import TRN
 
 
 def clean_whitespace(text):
@@ -211,31 +212,34 @@ class EBISubmission(object):
         get_output_fp = partial(join, self.full_ebi_dir)
         nvp = []
         nvim = []
-        for k, sample_prep in self.prep_template.items():
-            # validating required fields
-            if ('platform' not in sample_prep or
-                    sample_prep['platform'] is None):
-                nvp.append(k)
-            else:
-                platform = sample_prep['platform'].upper()
-                if platform not in self.valid_platforms:
+        # Read the prep samples in a single transaction, so their values are
+        # retrieved with a single query
+        with TRN:
+            for k, sample_prep in self.prep_template.items():
+                # validating required fields
+                if ('platform' not in sample_prep or
+                        sample_prep['platform'] is None):
                     nvp.append(k)
                 else:
-                    if ('instrument_model' not in sample_prep or
-                            sample_prep['instrument_model'] is None):
-                        nvim.append(k)
+                    platform = sample_prep['platform'].upper()
+                    if platform not in self.valid_platforms:
+                        nvp.append(k)
                     else:
-                        im = sample_prep['instrument_model'].upper()
-                        if im not in self.valid_platforms[platform]:
+                        if ('instrument_model' not in sample_prep or
+                                sample_prep['instrument_model'] is None):
                             nvim.append(k)
-
-            # IMPORTANT: note that we are generating the samples we are going
-            # to be using during submission and they come from the sample info
-            # file, however, we are only retrieving the samples that exist in
-            # the prep AKA not all samples
-            self.samples[k] = self.sample_template.get(sample_prep.id)
-            self.samples_prep[k] = sample_prep
-            self.sample_demux_fps[k] = get_output_fp(k)
+                        else:
+                            im = sample_prep['instrument_model'].upper()
+                            if im not in self.valid_platforms[platform]:
+                                nvim.append(k)
+
+                # IMPORTANT: note that we are generating the samples we are
+                # going to be using during submission and they come from the
+                # sample info file, however, we are only retrieving the samples
+                # that exist in the prep AKA not all samples
+                self.samples[k] = self.sample_template.get(sample_prep.id)
+                self.samples_prep[k] = sample_prep
+                self.sample_demux_fps[k] = get_output_fp(k)
 
         if nvp:
             error_msgs.append("These samples do not have a valid platform "
@@ -986,7 +990,17 @@ class EBISubmission(object):
         # helper function to write files in this method
         def _rename_file(fp, new_fp):
             if fp.endswith('.gz'):
-                copyfile(fp, new_fp)
+                # The files are only read during the submission, so when
+                # possible hard link them instead of copying their contents.
+                # Remove any previous file first, so we never write over a
+                # file that is linked to the original one
+                if exists(new_fp):
+                    remove(new_fp)
+                try:
+                    link(fp, new_fp)
+                except OSError:
+                    # e.g. the files live in different file systems
+                    copyfile(fp, new_fp)
             else:
                 cmd = "gzip -c %s > %s" % (fp, new_fp)
                 stdout, stderr, rv = system_call(cmd)
@@ -1056,8 +1070,8 @@ class EBISubmission(object):
         # `preprocessed_demux`. Thus, we only use the first one
         # (the only one present)
         ar = self.artifact
-        demux = [x['fp'] for x in ar.filepaths
-                 if x['fp_type'] == 'preprocessed_demux'][0]
+        demux = next(x['fp'] for x in ar.filepaths
+                     if x['fp_type'] == 'preprocessed_demux')
 
         demux_samples = set()
         with open_file(demux) as demux_fh: